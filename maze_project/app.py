@@ -1,97 +1,134 @@
+import argparse
+import time
+
+import numpy as np
 import pygame
-import random
-from collections import deque
+
+from generators import GENERATORS, generate, maze_ends
+from maze import OPEN, random_grid
+from solvers import SOLVERS, solve
 
 # Grid and display setup
 WIDTH = 600
 ROWS = 20
-CELL = WIDTH // ROWS
+FPS = 60
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 BLUE = (0, 0, 255)
 RED = (255, 0, 0)
 GREEN = (0, 255, 0)
 
-pygame.init()
-win = pygame.display.set_mode((WIDTH, WIDTH))
-pygame.display.set_caption("Maze Solver using DFS & BFS")
-
-# Create grid
-grid = [[0 for _ in range(ROWS)] for _ in range(ROWS)]
-
-# Random walls
-for i in range(ROWS):
-    for j in range(ROWS):
-        if random.random() < 0.3:
-            grid[i][j] = 1  # wall
-
-start = (0, 0)
-end = (ROWS-1, ROWS-1)
-grid[start[0]][start[1]] = 0
-grid[end[0]][end[1]] = 0
-
-def draw_grid():
-    for i in range(ROWS):
-        for j in range(ROWS):
-            color = WHITE if grid[i][j] == 0 else BLACK
-            pygame.draw.rect(win, color, (j*CELL, i*CELL, CELL, CELL))
+
+def draw_grid(grid, cell):
+    """Pre-render the walls once into a background surface"""
+    colors = np.where((grid == OPEN)[..., None], WHITE, BLACK).astype(np.uint8)
+    surface = pygame.surfarray.make_surface(colors.transpose(1, 0, 2))
+    rows, cols = grid.shape
+    return pygame.transform.scale(surface, (cols*cell, rows*cell))
+
+
+def paint_cells(win, cells, cols, cell, color):
+    """Fill the given flat cell indices and return their dirty rects"""
+    rects = []
+    for idx in cells:
+        r, c = divmod(int(idx), cols)
+        rects.append(win.fill(color, (c*cell, r*cell, cell, cell)))
+    return rects
+
+
+def replay(win, background, order, path, cols, cell, speed, budget_ms):
+    """Replay a recorded expansion order, then the path.
+
+    ``speed`` is in cells per second (0 draws as fast as the per-frame
+    budget allows). Each frame paints at most ``budget_ms`` worth of cells
+    and pushes only their rects to the display. +/- change the speed at
+    runtime, SPACE skips to the end. Returns False if the window closed.
+    """
+    clock = pygame.time.Clock()
+    win.blit(background, (0, 0))
     pygame.display.update()
 
-# def bfs(start, end):
-#     queue = deque([start])
-#     visited = {start: None}
-#     while queue:
-#         current = queue.popleft()
-#         if current == end:
-#             break
-#         r, c = current
-#         for dr, dc in [(1,0), (-1,0), (0,1), (0,-1)]:
-#             nr, nc = r+dr, c+dc
-#             if 0 <= nr < ROWS and 0 <= nc < ROWS and grid[nr][nc] == 0:
-#                 if (nr, nc) not in visited:
-#                     visited[(nr, nc)] = current
-#                     queue.append((nr, nc))
-#         pygame.draw.rect(win, BLUE, (c*CELL, r*CELL, CELL, CELL))
-#         pygame.display.update()
-#     return visited
-def bfs(start, end):
-    queue = deque([start])
-    visited = {start: None}
-    while queue:
-        current = queue.popleft()
-        if current == end:
-            break
-        r, c = current
-        for dr, dc in [(1,0), (-1,0), (0,1), (0,-1)]:
-            nr, nc = r+dr, c+dc
-            if 0 <= nr < ROWS and 0 <= nc < ROWS and grid[nr][nc] == 0:
-                if (nr, nc) not in visited:
-                    visited[(nr, nc)] = current
-                    queue.append((nr, nc))
-        pygame.draw.rect(win, BLUE, (c*CELL, r*CELL, CELL, CELL))
-        pygame.display.update()
-        pygame.time.delay(50)  # delay 50 milliseconds for slow animation
-    return visited
-
-
-draw_grid()
-visited = bfs(start, end)
-
-# reconstruct path
-if end in visited:
-    node = end
+    shown = 0
+    owed = 0.0
+    while shown < len(order):
+        dt = clock.tick(FPS) / 1000
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+            if event.type == pygame.KEYDOWN:
+                if event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    speed = max(1, speed * 2)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS) and speed:
+                    speed = max(1, speed // 2)
+                elif event.key == pygame.K_SPACE:
+                    speed = 0
+
+        owed = len(order) if speed == 0 else owed + speed * dt
+        deadline = time.perf_counter() + budget_ms / 1000
+        rects = []
+        while shown < min(len(order), int(owed)) and time.perf_counter() < deadline:
+            batch = order[shown:min(len(order), int(owed), shown + 256)]
+            rects += paint_cells(win, batch, cols, cell, BLUE)
+            shown += len(batch)
+        pygame.display.update(rects)
+
+    rects = paint_cells(win, [r*cols + c for r, c in path], cols, cell, GREEN)
+    pygame.display.update(rects)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maze Solver")
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--solver", choices=sorted(SOLVERS), default="bfs")
+    parser.add_argument("--generator", choices=["random"] + sorted(GENERATORS),
+                        default="random", help="scattered walls or a perfect maze")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--speed", type=int, default=200,
+                        help="cells painted per second, 0 for instant (animation only)")
+    parser.add_argument("--budget", type=float, default=8.0,
+                        help="milliseconds of drawing allowed per frame")
+    args = parser.parse_args()
+
+    if args.generator == "random":
+        grid = random_grid(args.rows, seed=args.seed)
+        start = (0, 0)
+        end = (args.rows-1, args.rows-1)
+    else:
+        rooms = max(1, args.rows // 2)
+        grid = generate(args.generator, rooms, seed=args.seed)
+        start, end = maze_ends(rooms, rooms)
+    rows = grid.shape[0]
+    cell = max(1, WIDTH // rows)
+
+    # Solve at full speed first; the animation only replays the recording
+    visited, stats = solve(grid, start, end, args.solver, record=True)
+    print(f"{stats.solver}: {stats.expanded} expanded, peak frontier "
+          f"{stats.peak_frontier}, {stats.seconds * 1000:.1f} ms")
+
+    path = []
+    node = end if end in visited else None
     while node:
-        r, c = node
-        pygame.draw.rect(win, GREEN, (c*CELL, r*CELL, CELL, CELL))
-        pygame.display.update()
+        path.append(node)
         node = visited[node]
 
-# Keep window open until user closes it
-running = True
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
+    pygame.init()
+    win = pygame.display.set_mode((rows*cell, rows*cell))
+    pygame.display.set_caption(f"Maze Solver using {args.solver}")
+    background = draw_grid(grid, cell)
+
+    running = replay(win, background, stats.order, path, rows, cell,
+                     args.speed, args.budget)
+
+    # Keep window open until user closes it
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+        pygame.time.wait(20)
+
+    pygame.quit()
 
-pygame.quit()
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark: LPA* path repair vs. a full BFS re-solve under random edits.
+
+    python maze_project/bench_replan.py --rows 1000 --edits 200
+
+Every edit toggles one random cell (never the start or goal). After each
+edit both the Replanner and a fresh bfs() produce a path; with --check
+the two paths are compared cell by cell.
+"""
+import argparse
+import random
+import statistics
+import time
+
+from maze import random_grid, bfs, reconstruct_path
+from replan import Replanner
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--density", type=float, default=0.25)
+    parser.add_argument("--edits", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true", help="compare paths after every edit")
+    args = parser.parse_args()
+
+    rows = args.rows
+    start, goal = (0, 0), (rows - 1, rows - 1)
+    grid = random_grid(rows, density=args.density, seed=args.seed)
+    rng = random.Random(args.seed)
+
+    t0 = time.perf_counter()
+    planner = Replanner(grid, start, goal)
+    planner.path()
+    print(f"initial LPA* plan: {time.perf_counter() - t0:.3f} s, "
+          f"{planner.expanded} expanded")
+
+    repair, full, expanded = [], [], []
+    for _ in range(args.edits):
+        cell = start
+        while cell in (start, goal):
+            cell = (rng.randrange(rows), rng.randrange(rows))
+        grid[cell] ^= 1
+
+        t0 = time.perf_counter()
+        planner.set_cell(cell, grid[cell])
+        path = planner.path()
+        repair.append(time.perf_counter() - t0)
+        expanded.append(planner.expanded)
+
+        t0 = time.perf_counter()
+        _, parent = bfs(grid, start, goal)
+        fresh = reconstruct_path(parent, goal)
+        full.append(time.perf_counter() - t0)
+
+        if args.check and path != fresh:
+            raise SystemExit(f"path mismatch after editing {cell}")
+
+    for name, times in (("LPA* repair", repair), ("BFS re-solve", full)):
+        print(f"{name:<13} mean {statistics.mean(times) * 1000:8.3f} ms  "
+              f"median {statistics.median(times) * 1000:8.3f} ms  "
+              f"max {max(times) * 1000:8.3f} ms")
+    print(f"repair expanded: mean {statistics.mean(expanded):.1f}, max {max(expanded)}")
+    print(f"speed-up (total): {sum(full) / sum(repair):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""Seeded perfect-maze generators writing straight into a uint8 grid.
+
+A maze of ``rows`` x ``cols`` rooms lives in a grid of shape
+``(2*rows + 1, 2*cols + 1)``: rooms sit on odd coordinates, everything
+starts as WALL and carving opens a room and the wall cell between it and
+its neighbour. Every generated maze is a spanning tree, so any two rooms
+are connected by exactly one path.
+
+The grid can be any writable C-contiguous uint8 array, including a
+``np.memmap`` from ``open_grid()`` for mazes bigger than RAM. Each
+algorithm is a Python generator that yields the number of rooms carved
+so far every ``chunk`` rooms, so callers can report progress or flush.
+"""
+import argparse
+import random
+import time
+from array import array
+
+import numpy as np
+
+from maze import OPEN, WALL
+
+GENERATORS = {}
+
+# bytes of working memory per room, on top of the grid itself
+WORKSPACE = {
+    "backtracker": 9,  # padded seen bytes + two int32 stacks at worst
+    "kruskal": 13,     # int32 union-find parents (over-allocated ~2%) + int32 shuffled edge ids
+    "wilson": 2,       # padded state bytes + walk direction bytes
+}
+OVERHEAD = 64 << 10  # generator frame, RNG state, slices: the same at any size
+
+
+def register(name):
+    """Decorator adding a carving generator to GENERATORS under ``name``"""
+    def wrap(func):
+        GENERATORS[name] = func
+        return func
+    return wrap
+
+
+# -------------------------------
+# Grid helpers
+# -------------------------------
+def maze_shape(rows, cols):
+    return 2 * rows + 1, 2 * cols + 1
+
+
+def maze_ends(rows, cols):
+    """Top-left and bottom-right room, as grid cells"""
+    return (1, 1), (2 * rows - 1, 2 * cols - 1)
+
+
+def estimate_bytes(algorithm, rows, cols):
+    """Peak memory of generating a rows x cols maze, grid included"""
+    height, width = maze_shape(rows, cols)
+    return height * width + WORKSPACE[algorithm] * (rows + 2) * (cols + 2) + OVERHEAD
+
+
+def open_grid(path, rows, cols):
+    """Disk-backed ``.npy`` grid for mazes that should not live in RAM"""
+    return np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8,
+                                     shape=maze_shape(rows, cols))
+
+
+def generate(algorithm, rows, cols=None, seed=None, out=None, max_bytes=None,
+             chunk=1 << 16, progress=None):
+    """Build a maze with one of GENERATORS and return its grid.
+
+    ``out`` is filled in place when given. ``max_bytes`` rejects sizes whose
+    estimated peak memory (see ``estimate_bytes``) would not fit. ``progress``
+    is called with the rooms carved so far every ``chunk`` rooms.
+    """
+    cols = rows if cols is None else cols
+    if max_bytes is not None:
+        # a caller-provided grid (e.g. a memmap) does not count against RAM
+        need = estimate_bytes(algorithm, rows, cols)
+        if out is not None:
+            need -= out.size
+        if need > max_bytes:
+            raise MemoryError(f"{algorithm} needs about {need} bytes for a "
+                              f"{rows}x{cols} maze, budget is {max_bytes}")
+    grid = np.empty(maze_shape(rows, cols), dtype=np.uint8) if out is None else out
+    if grid.shape != maze_shape(rows, cols) or grid.dtype != np.uint8:
+        raise ValueError(f"grid must be uint8 with shape {maze_shape(rows, cols)}")
+    grid[...] = WALL
+    for carved in GENERATORS[algorithm](grid, rows, cols, seed, chunk):
+        if progress is not None:
+            progress(carved)
+    return grid
+
+
+def _cells(grid):
+    """Writable byte view of the grid so per-cell access skips NumPy scalars"""
+    return memoryview(grid).cast("B")
+
+
+# -------------------------------
+# Generators
+# -------------------------------
+@register("backtracker")
+def carve_backtracker(grid, rows, cols, seed, chunk):
+    """Recursive backtracker (randomised DFS) with an explicit stack"""
+    rng = random.Random(seed)
+    cells = _cells(grid)
+    width = 2 * cols + 1
+    pw = cols + 2  # padded room row length; the border counts as seen
+    seen = bytearray(b"\x01") * ((rows + 2) * pw)
+    for r in range(rows):
+        seen[(r + 1) * pw + 1:(r + 1) * pw + 1 + cols] = bytes(cols)
+    # room offset -> offset of the wall cell in between
+    steps = ((1, 1), (-1, -1), (pw, width), (-pw, -width))
+
+    start = pw + 1
+    seen[start] = 1
+    cells[width + 1] = OPEN
+    rooms = array("i", [start])
+    walls = array("i", [width + 1])
+    carved = 1
+    while rooms:
+        room = rooms[-1]
+        options = [step for step in steps if not seen[room + step[0]]]
+        if not options:
+            rooms.pop()
+            walls.pop()
+            continue
+        d, half = options[rng.randrange(len(options))] if len(options) > 1 else options[0]
+        cell = walls[-1] + half
+        cells[cell] = OPEN
+        cells[cell + half] = OPEN
+        seen[room + d] = 1
+        rooms.append(room + d)
+        walls.append(cell + half)
+        carved += 1
+        if carved % chunk == 0:
+            yield carved
+    yield carved
+
+
+@register("kruskal")
+def carve_kruskal(grid, rows, cols, seed, chunk):
+    """Randomised Kruskal over shuffled walls with a union-find forest"""
+    rng = np.random.default_rng(seed)
+    cells = _cells(grid)
+    width = 2 * cols + 1
+    total = rows * cols
+    parent = array("i", range(total))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # path halving
+            x = parent[x]
+        return x
+
+    for r in range(rows):
+        row = (2 * r + 1) * width
+        cells[row + 1:row + width:2] = bytes(cols)
+
+    # edge e < horizontal joins room e' = (e // (cols-1), e % (cols-1)) to
+    # its right neighbour; the rest join a room to the one below it
+    horizontal = rows * (cols - 1)
+    # shuffled in place as int32, and read through a memoryview so no
+    # int64 or list copy of it ever exists
+    edges = np.arange(horizontal + (rows - 1) * cols, dtype=np.int32)
+    rng.shuffle(edges)
+    view = memoryview(edges)
+    carved = 1
+    for start in range(0, len(edges), chunk):
+        for e in view[start:start + chunk]:
+            if e < horizontal:
+                r, c = divmod(e, cols - 1)
+                a = r * cols + c
+                b = a + 1
+                cell = (2 * r + 1) * width + 2 * c + 2
+            else:
+                a = e - horizontal
+                b = a + cols
+                r, c = divmod(a, cols)
+                cell = (2 * r + 2) * width + 2 * c + 1
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[ra] = rb
+                cells[cell] = OPEN
+                carved += 1
+                if carved == total:
+                    break
+        yield carved
+        if carved == total:
+            break
+    view.release()
+    del edges
+
+
+@register("wilson")
+def carve_wilson(grid, rows, cols, seed, chunk):
+    """Wilson's algorithm: loop-erased random walks, uniform spanning tree"""
+    rng = random.Random(seed)
+    cells = _cells(grid)
+    width = 2 * cols + 1
+    pw = cols + 2
+    OUT, IN, BORDER = 0, 1, 2
+    state = bytearray([BORDER]) * ((rows + 2) * pw)
+    for r in range(rows):
+        state[(r + 1) * pw + 1:(r + 1) * pw + 1 + cols] = bytes(cols)
+    heading = bytearray(len(state))
+    steps = ((1, 1), (-1, -1), (pw, width), (-pw, -width))
+
+    def cell_of(room):
+        r, c = divmod(room, pw)
+        return (2 * r - 1) * width + 2 * c - 1
+
+    root = pw + 1
+    state[root] = IN
+    cells[cell_of(root)] = OPEN
+    carved = 1
+    next_report = chunk
+    for r in range(rows):
+        for room in range((r + 1) * pw + 1, (r + 1) * pw + 1 + cols):
+            if state[room] != OUT:
+                continue
+            # random walk until the tree is hit; heading keeps only the last
+            # exit taken from each room, which erases loops implicitly
+            node = room
+            while state[node] != IN:
+                k = rng.randrange(4)
+                while state[node + steps[k][0]] == BORDER:
+                    k = rng.randrange(4)
+                heading[node] = k
+                node += steps[k][0]
+            # replay the loop-erased walk into the tree
+            node = room
+            cell = cell_of(node)
+            while state[node] != IN:
+                d, half = steps[heading[node]]
+                state[node] = IN
+                cells[cell] = OPEN
+                cells[cell + half] = OPEN
+                node += d
+                cell += 2 * half
+                carved += 1
+            if carved >= next_report:
+                next_report += chunk
+                yield carved
+    yield carved
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a perfect maze")
+    parser.add_argument("algorithm", choices=sorted(GENERATORS))
+    parser.add_argument("--rows", type=int, default=1000, help="rooms per side")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the grid to this .npy file (memory-mapped)")
+    parser.add_argument("--max-mb", type=float, default=None, help="memory budget")
+    args = parser.parse_args()
+
+    out = open_grid(args.out, args.rows, args.rows) if args.out else None
+    budget = None if args.max_mb is None else int(args.max_mb * 2**20)
+    t0 = time.perf_counter()
+    grid = generate(args.algorithm, args.rows, seed=args.seed, out=out, max_bytes=budget)
+    print(f"{args.algorithm}: {grid.shape[0]}x{grid.shape[1]} grid in "
+          f"{time.perf_counter() - t0:.2f} s")
+    if out is not None:
+        out.flush()
@@ -0,0 +1,239 @@
+"""Headless maze engine: compact NumPy grids and wavefront BFS.
+
+Nothing in here touches pygame, so it can be imported by the viewer in
+app.py, by scripts and by services alike.
+"""
+import numpy as np
+
+OPEN = 0
+WALL = 1
+
+# Same neighbour order as the original bfs(): down, up, right, left
+DIRS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+
+# -------------------------------
+# Grid helpers
+# -------------------------------
+def random_grid(rows, cols=None, density=0.3, seed=None, start=None, end=None):
+    """Grid of scattered walls; start/end (default corners) are kept open"""
+    cols = rows if cols is None else cols
+    rng = np.random.default_rng(seed)
+    grid = (rng.random((rows, cols), dtype=np.float32) < density).astype(np.uint8)
+    start = (0, 0) if start is None else start
+    end = (rows - 1, cols - 1) if end is None else end
+    grid[start] = OPEN
+    grid[end] = OPEN
+    return grid
+
+
+def _padded_open(grid):
+    """Flat bool mask of open cells with a one-cell wall border around it"""
+    rows, cols = grid.shape
+    free = np.zeros((rows + 2, cols + 2), dtype=bool)
+    free[1:-1, 1:-1] = grid == OPEN
+    return free.ravel()
+
+
+def _offsets(cols):
+    width = cols + 2
+    return [dr * width + dc for dr, dc in DIRS]
+
+
+# -------------------------------
+# Wavefront BFS
+# -------------------------------
+def bfs(grid, start, end=None, stats=None):
+    """Breadth-first search that expands a whole frontier per NumPy step.
+
+    Returns ``(dist, parent)``, both int32 arrays shaped like ``grid``.
+    ``dist`` is -1 for unreached cells. ``parent`` holds the flat index of
+    the previous cell (``r * cols + c``), the start's own index for the
+    start and -1 for unreached cells. When ``end`` is given the search
+    stops at the wavefront that reaches it. If a ``stats`` dict is passed
+    it receives ``expanded`` and ``peak_frontier`` counts; if it also holds
+    an ``order`` list, each expanded wavefront is appended to it as an
+    array of flat cell indices.
+
+    A cell's parent is its neighbour one step closer to the start, picked
+    in ``DIRS`` order, so the result depends only on the distances.
+    """
+    rows, cols = grid.shape
+    width = cols + 2
+    unvisited = _padded_open(grid)
+    dist = np.full(unvisited.size, -1, dtype=np.int32)
+    parent = np.full(unvisited.size, -1, dtype=np.int32)
+
+    source = (start[0] + 1) * width + start[1] + 1
+    target = -1 if end is None else (end[0] + 1) * width + end[1] + 1
+    if unvisited[source]:
+        unvisited[source] = False
+        dist[source] = 0
+        parent[source] = start[0] * cols + start[1]
+        frontier = np.array([source], dtype=np.int32)
+    else:
+        frontier = np.empty(0, dtype=np.int32)
+
+    offsets = _offsets(cols)
+    order = None if stats is None else stats.get("order")
+    level = 0
+    expanded = peak = 0
+    while frontier.size and (target < 0 or dist[target] < 0):
+        level += 1
+        expanded += frontier.size
+        peak = max(peak, frontier.size)
+        reached = []
+        # parents are stored as unpadded indices so no fix-up pass is needed
+        unpadded = frontier - width - 1 - 2 * (frontier // width - 1)
+        if order is not None:
+            order.append(unpadded)
+        for off in offsets:
+            nbr = frontier + off
+            fresh = unvisited[nbr]
+            nbr = nbr[fresh]
+            unvisited[nbr] = False
+            dist[nbr] = level
+            parent[nbr] = unpadded[fresh]
+            reached.append(nbr)
+        frontier = np.concatenate(reached)
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["peak_frontier"] = peak
+    return _unpad(dist, rows, cols), _unpad(parent, rows, cols)
+
+
+def bidirectional_bfs(grid, start, end, stats=None):
+    """Wavefront BFS grown from both ends, always advancing the smaller side.
+
+    Returns a ``parent`` array like ``bfs()``: the forward search tree plus
+    the backward half of the path, so ``reconstruct_path(parent, end)``
+    yields a shortest path. ``end`` stays -1 when it cannot be reached.
+    ``stats`` works as in ``bfs()``.
+    """
+    rows, cols = grid.shape
+    width = cols + 2
+    offsets = _offsets(cols)
+    free = _padded_open(grid)
+    sides = []
+    for cell in (start, end):
+        node = (cell[0] + 1) * width + cell[1] + 1
+        dist = np.full(free.size, -1, dtype=np.int32)
+        parent = np.full(free.size, -1, dtype=np.int32)
+        frontier = np.empty(0, dtype=np.int32)
+        if free[node]:
+            dist[node] = 0
+            parent[node] = node
+            frontier = np.array([node], dtype=np.int32)
+        sides.append([dist, parent, frontier, 0])
+
+    order = None if stats is None else stats.get("order")
+    expanded = peak = 0
+    meet = -1
+    if tuple(start) == tuple(end) and sides[0][2].size:
+        meet = int(sides[0][2][0])
+    while meet < 0 and sides[0][2].size and sides[1][2].size:
+        peak = max(peak, sides[0][2].size + sides[1][2].size)
+        side, other = sides if sides[0][2].size <= sides[1][2].size else sides[::-1]
+        dist, parent, frontier, level = side
+        level += 1
+        expanded += frontier.size
+        if order is not None:
+            order.append(frontier - width - 1 - 2 * (frontier // width - 1))
+        reached = []
+        for off in offsets:
+            nbr = frontier + off
+            fresh = free[nbr] & (dist[nbr] < 0)
+            nbr = nbr[fresh]
+            dist[nbr] = level
+            parent[nbr] = frontier[fresh]
+            reached.append(nbr)
+        frontier = np.concatenate(reached)
+        side[2], side[3] = frontier, level
+        # every cell seen by both sides closes a path; keep the shortest
+        seen = frontier[other[0][frontier] >= 0]
+        if seen.size:
+            meet = int(seen[np.argmin(other[0][seen])])
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["peak_frontier"] = peak
+
+    parent = sides[0][1]
+    if meet >= 0:
+        # flip the backward chain so it points from the end back to meet
+        back = sides[1][1]
+        node = meet
+        while back[node] != node:
+            nxt = int(back[node])
+            parent[nxt] = node
+            node = nxt
+    return _unpad_index(parent, rows, cols)
+
+
+def _unpad(arr, rows, cols):
+    return np.ascontiguousarray(arr.reshape(rows + 2, cols + 2)[1:-1, 1:-1])
+
+
+def _unpad_index(parent, rows, cols):
+    """Unpad an array of padded flat indices, keeping -1 as-is"""
+    width = cols + 2
+    inner = _unpad(parent, rows, cols)
+    idx = inner - width - 1 - 2 * (inner // width - 1)
+    return np.where(inner < 0, -1, idx).astype(np.int32)
+
+
+# -------------------------------
+# Path reconstruction
+# -------------------------------
+def reconstruct_path(parent, end):
+    """Cells from start to end as (r, c) tuples, or [] if end was not reached"""
+    cols = parent.shape[1]
+    flat = parent.ravel()
+    node = end[0] * cols + end[1]
+    if flat[node] < 0:
+        return []
+    path = []
+    while True:
+        path.append(divmod(node, cols))
+        prev = int(flat[node])
+        if prev == node:
+            break
+        node = prev
+    path.reverse()
+    return path
+
+
+class ParentMap:
+    """Read-only view of a parent array with the old ``visited`` dict contract.
+
+    ``cell in visited`` tells whether a cell was reached and
+    ``visited[cell]`` gives the previous cell, or None for the start.
+    """
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.rows, self.cols = parent.shape
+
+    def __contains__(self, cell):
+        r, c = cell
+        return 0 <= r < self.rows and 0 <= c < self.cols and self.parent[r, c] >= 0
+
+    def __getitem__(self, cell):
+        if cell not in self:
+            raise KeyError(cell)
+        r, c = cell
+        prev = int(self.parent[r, c])
+        if prev == r * self.cols + c:
+            return None
+        return divmod(prev, self.cols)
+
+    def get(self, cell, default=None):
+        return self[cell] if cell in self else default
+
+    def __iter__(self):
+        for idx in np.flatnonzero(self.parent >= 0):
+            yield divmod(int(idx), self.cols)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.parent >= 0))
@@ -0,0 +1,145 @@
+"""Many start/end queries against one grid, backed by cached BFS fields.
+
+``MazeQueries`` keeps one ``(dist, parent)`` field per source in a bounded
+LRU cache keyed by ``(grid version, source)``. Any number of targets can
+then be answered from a field: distances in O(1), paths in O(path
+length). Editing a wall bumps the version. Fields the edit cannot affect
+move to the new version untouched; fields where only the edited cell
+changes are patched in place; the rest are dropped and rebuilt on
+demand.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+from maze import DIRS, OPEN, WALL, bfs, reconstruct_path
+
+
+class MazeQueries:
+    def __init__(self, grid, capacity=8):
+        self.grid = grid
+        self.capacity = capacity
+        self.version = 0
+        self.cache = OrderedDict()  # (version, source) -> (dist, parent)
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0, "patched": 0, "invalidated": 0}
+
+    # -------------------------------
+    # Queries
+    # -------------------------------
+    def field(self, source):
+        """``(dist, parent)`` arrays for ``source``, computed at most once per version"""
+        source = tuple(source)
+        key = (self.version, source)
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.stats["hits"] += 1
+            self.cache.move_to_end(key)
+            return entry
+        self.stats["misses"] += 1
+        entry = bfs(self.grid, source)
+        self.cache[key] = entry
+        if len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+            self.stats["evicted"] += 1
+        return entry
+
+    def distance(self, source, target):
+        """Steps from source to target, -1 if unreachable"""
+        dist, _ = self.field(source)
+        return int(dist[tuple(target)])
+
+    def path(self, source, target):
+        """Shortest path as (r, c) tuples, [] if unreachable"""
+        _, parent = self.field(source)
+        return reconstruct_path(parent, tuple(target))
+
+    def paths(self, source, targets):
+        """Paths from one source to many targets off a single field"""
+        _, parent = self.field(source)
+        return [reconstruct_path(parent, tuple(t)) for t in targets]
+
+    def distances(self, source, targets):
+        """Distances from one source to an (n, 2) array of targets"""
+        dist, _ = self.field(source)
+        targets = np.asarray(targets)
+        return dist[targets[:, 0], targets[:, 1]]
+
+    # -------------------------------
+    # Edits
+    # -------------------------------
+    def toggle_wall(self, cell):
+        """Flip one cell between OPEN and WALL; returns the new value"""
+        cell = tuple(cell)
+        value = OPEN if self.grid[cell] == WALL else WALL
+        self.set_cell(cell, value)
+        return value
+
+    def set_cell(self, cell, value):
+        """Write one cell and keep whatever cached fields survive the edit"""
+        cell = tuple(cell)
+        if self.grid[cell] == value:
+            return
+        self.grid[cell] = value
+        self.version += 1
+        kept = OrderedDict()
+        for (_, source), (dist, parent) in self.cache.items():
+            if self._repair(dist, parent, source, cell, value):
+                kept[(self.version, source)] = (dist, parent)
+            else:
+                self.stats["invalidated"] += 1
+        self.cache = kept
+
+    def _repair(self, dist, parent, source, cell, value):
+        """Bring one field up to date with a single-cell edit.
+
+        Returns False when the edit can change distances beyond ``cell``
+        itself and the field has to be recomputed.
+        """
+        rows, cols = self.grid.shape
+        r, c = cell
+        neighbors = [(r + dr, c + dc) for dr, dc in DIRS
+                     if 0 <= r + dr < rows and 0 <= c + dc < cols]
+
+        if value == WALL:
+            if dist[cell] < 0:
+                return True  # the field never reached it
+            if cell == source:
+                return False
+            # a cell nobody descends from can vanish without moving anyone
+            index = r * cols + c
+            if any(parent[n] == index for n in neighbors):
+                return False
+            dist[cell] = -1
+            parent[cell] = -1
+            self.stats["patched"] += 1
+            return True
+
+        if cell == source:
+            return False
+        reached = [int(dist[n]) for n in neighbors if dist[n] >= 0]
+        if not reached:
+            return True  # still cut off from the source
+        if any(self.grid[n] == OPEN and dist[n] < 0 for n in neighbors):
+            return False  # opens a way into an unreached region
+        if max(reached) - min(reached) > 2:
+            return False  # opens a shortcut
+        # distances elsewhere stay put, but the new cell may become the
+        # preferred parent of a neighbour under bfs()'s DIRS tie-break
+        dist[cell] = min(reached) + 1
+        for n in [cell] + neighbors:
+            if dist[n] > 0:
+                parent[n] = _canonical_parent(dist, n)
+        self.stats["patched"] += 1
+        return True
+
+
+def _canonical_parent(dist, cell):
+    """The parent bfs() would pick: first DIRS neighbour one step closer"""
+    rows, cols = dist.shape
+    r, c = cell
+    for dr, dc in DIRS:
+        # bfs() reaches a cell from the neighbour behind the move
+        pr, pc = r - dr, c - dc
+        if 0 <= pr < rows and 0 <= pc < cols and dist[pr, pc] == dist[cell] - 1:
+            return pr * cols + pc
+    return -1
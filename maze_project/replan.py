@@ -0,0 +1,137 @@
+"""Incremental replanning with Lifelong Planning A* (LPA*).
+
+``Replanner`` keeps its g/rhs values and priority queue between calls.
+After walls change, ``path()`` only re-expands the vertices whose
+distance from the start can have changed. Distances are exact on every
+shortest path, so the path is read back with the same DIRS tie-break as
+``maze.bfs()``: it is the very path a fresh BFS would return.
+
+The start and goal are fixed for the planner's lifetime (LPA*). Moving
+either one means building a new Replanner.
+"""
+import heapq
+
+from maze import DIRS, OPEN, _padded_open
+
+INF = float("inf")
+
+
+class Replanner:
+    def __init__(self, grid, start, goal):
+        self.rows, self.cols = grid.shape
+        self.width = self.cols + 2
+        self.free = bytearray(_padded_open(grid).tobytes())
+        self.offsets = [dr * self.width + dc for dr, dc in DIRS]
+        self.start = self._index(start)
+        self.goal = self._index(goal)
+        self.gr, self.gc = divmod(self.goal, self.width)
+
+        size = len(self.free)
+        self.g = [INF] * size
+        self.rhs = [INF] * size
+        self.queued = {}  # node -> key it was last pushed with
+        self.heap = []
+        self.expanded = 0  # vertices expanded by the last path() call
+
+        self._update_vertex(self.start)
+
+    def _index(self, cell):
+        return (cell[0] + 1) * self.width + cell[1] + 1
+
+    def _cell(self, node):
+        return node // self.width - 1, node % self.width - 1
+
+    def _h(self, node):
+        r, c = divmod(node, self.width)
+        return abs(r - self.gr) + abs(c - self.gc)
+
+    def _key(self, node):
+        best = min(self.g[node], self.rhs[node])
+        return (best + self._h(node), best)
+
+    def _push(self, node):
+        key = self._key(node)
+        self.queued[node] = key
+        heapq.heappush(self.heap, (key, node))
+
+    def _top_key(self):
+        while self.heap:
+            key, node = self.heap[0]
+            if self.queued.get(node) == key:
+                return key
+            heapq.heappop(self.heap)  # stale entry
+        return (INF, INF)
+
+    def _update_vertex(self, node):
+        if not self.free[node]:
+            self.rhs[node] = INF
+        elif node == self.start:
+            self.rhs[node] = 0
+        else:
+            g = self.g
+            self.rhs[node] = min((g[node + off] + 1 for off in self.offsets
+                                  if self.free[node + off]), default=INF)
+        self.queued.pop(node, None)
+        if self.g[node] != self.rhs[node]:
+            self._push(node)
+
+    def _compute(self):
+        g, rhs, goal = self.g, self.rhs, self.goal
+        expanded = 0
+        while self._top_key() < self._key(goal) or rhs[goal] != g[goal]:
+            if not self.heap:
+                break
+            _, node = heapq.heappop(self.heap)
+            del self.queued[node]
+            expanded += 1
+            if g[node] > rhs[node]:
+                g[node] = rhs[node]
+            else:
+                g[node] = INF
+                self._update_vertex(node)
+            for off in self.offsets:
+                if self.free[node + off]:
+                    self._update_vertex(node + off)
+        self.expanded = expanded
+
+    # -------------------------------
+    # Public API
+    # -------------------------------
+    def set_cell(self, cell, value):
+        """Apply one wall edit; the repair happens on the next path() call"""
+        node = self._index(cell)
+        free = int(value == OPEN)
+        if self.free[node] == free:
+            return
+        self.free[node] = free
+        self._update_vertex(node)
+        for off in self.offsets:
+            if self.free[node + off]:
+                self._update_vertex(node + off)
+
+    def distance(self):
+        """Steps from start to goal, -1 if unreachable"""
+        self._compute()
+        d = self.g[self.goal]
+        return -1 if d == INF else d
+
+    def path(self):
+        """Shortest path as (r, c) tuples, [] if unreachable"""
+        if self.distance() < 0:
+            return []
+        g = self.g
+        node = self.goal
+        path = [self._cell(node)]
+        while node != self.start:
+            # bfs() reaches a cell from the neighbour behind the first move
+            # in DIRS order that is one step closer to the start
+            want = g[node] - 1
+            for off in self.offsets:
+                if g[node - off] == want and self.free[node - off]:
+                    node -= off
+                    break
+            else:
+                raise RuntimeError("inconsistent planner state")
+            path.append(self._cell(node))
+        path.reverse()
+        return path
@@ -0,0 +1,283 @@
+"""Pluggable maze solvers with node-expansion metrics.
+
+Every solver takes ``(grid, start, end, stats)`` and returns a ``visited``
+parent map with the same contract as the original ``bfs()``: ``cell in
+visited`` for reached cells and ``visited[cell]`` for the previous cell on
+the way back to ``start`` (None for ``start`` itself). Solvers fill
+``stats`` with ``expanded`` and ``peak_frontier``; ``solve()`` adds the
+wall time. When ``stats`` holds an ``order`` list, solvers also append
+the flat indices of expanded cells, in expansion order, as arrays.
+"""
+import argparse
+import heapq
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from maze import DIRS, ParentMap, _padded_open, bfs, bidirectional_bfs, random_grid
+
+SOLVERS = {}
+
+
+@dataclass
+class SolveStats:
+    solver: str
+    expanded: int
+    peak_frontier: int
+    seconds: float
+    path_length: int  # steps from start to end, -1 if unreachable
+    order: np.ndarray = None  # expanded cells as flat indices, if recorded
+
+
+def register(name):
+    """Decorator adding a solver function to SOLVERS under ``name``"""
+    def wrap(func):
+        SOLVERS[name] = func
+        return func
+    return wrap
+
+
+def solve(grid, start, end, method="bfs", record=False):
+    """Run one registered solver and return ``(visited, SolveStats)``.
+
+    With ``record=True`` the expansion order is kept in ``SolveStats.order``
+    so a viewer can replay it later.
+    """
+    solver = SOLVERS[method]
+    stats = {"order": []} if record else {}
+    t0 = time.perf_counter()
+    visited = solver(grid, start, end, stats)
+    seconds = time.perf_counter() - t0
+    order = None
+    if record:
+        order = np.concatenate(stats["order"] or [np.empty(0, dtype=np.int32)])
+    return visited, SolveStats(method, stats["expanded"], stats["peak_frontier"],
+                               seconds, path_length(visited, end), order)
+
+
+def path_length(visited, end):
+    if end not in visited:
+        return -1
+    steps = 0
+    node = visited[end]
+    while node is not None:
+        steps += 1
+        node = visited[node]
+    return steps
+
+
+def compare(grid, start, end, methods=None):
+    """SolveStats for every solver (or the given ones) on the same query"""
+    return [solve(grid, start, end, name)[1] for name in (methods or SOLVERS)]
+
+
+# -------------------------------
+# Shared helpers (padded flat indices)
+# -------------------------------
+def _setup(grid, start, end):
+    cols = grid.shape[1]
+    width = cols + 2
+    free = _padded_open(grid).tobytes()
+    source = (start[0] + 1) * width + start[1] + 1
+    target = (end[0] + 1) * width + end[1] + 1
+    return free, width, source, target
+
+
+def _to_visited(came_from, width):
+    """Padded ``{node: prev}`` ints to the ``{(r, c): (r, c) or None}`` contract"""
+    visited = {}
+    for node, prev in came_from.items():
+        cell = (node // width - 1, node % width - 1)
+        visited[cell] = None if prev == node else (prev // width - 1, prev % width - 1)
+    return visited
+
+
+# -------------------------------
+# Registered solvers
+# -------------------------------
+@register("bfs")
+def solve_bfs(grid, start, end, stats):
+    _, parent = bfs(grid, start, end, stats)
+    return ParentMap(parent)
+
+
+@register("bidirectional")
+def solve_bidirectional(grid, start, end, stats):
+    return ParentMap(bidirectional_bfs(grid, start, end, stats))
+
+
+@register("astar")
+def solve_astar(grid, start, end, stats):
+    """A* with a Manhattan heuristic, closed set and stale-entry skipping"""
+    free, width, source, target = _setup(grid, start, end)
+    offsets = [dr * width + dc for dr, dc in DIRS]
+    tr, tc = divmod(target, width)
+
+    def h(node):
+        r, c = divmod(node, width)
+        return abs(r - tr) + abs(c - tc)
+
+    came_from = {}
+    g_score = {}
+    closed = set()
+    heap = []
+    trace = [] if "order" in stats else None
+    expanded = peak = 0
+    if free[source]:
+        came_from[source] = source
+        g_score[source] = 0
+        heap.append((h(source), h(source), source))
+
+    while heap:
+        peak = max(peak, len(heap))
+        _, _, current = heapq.heappop(heap)
+        if current in closed:
+            continue
+        closed.add(current)
+        expanded += 1
+        if trace is not None:
+            trace.append(current - width - 1 - 2 * (current // width - 1))
+        if current == target:
+            break
+        new_cost = g_score[current] + 1
+        for off in offsets:
+            neighbor = current + off
+            if free[neighbor] and new_cost < g_score.get(neighbor, new_cost + 1):
+                g_score[neighbor] = new_cost
+                came_from[neighbor] = current
+                hn = h(neighbor)
+                heapq.heappush(heap, (new_cost + hn, hn, neighbor))
+
+    stats["expanded"] = expanded
+    stats["peak_frontier"] = peak
+    if trace is not None:
+        stats["order"].append(np.array(trace, dtype=np.int32))
+    return _to_visited(came_from, width)
+
+
+@register("jps")
+def solve_jps(grid, start, end, stats):
+    """Jump Point Search for uniform-cost 4-connected grids.
+
+    Horizontal runs only turn vertical at forced neighbours (the cell
+    behind on that side is a wall); vertical runs stop wherever a
+    horizontal scan would find a jump point. A* then runs over jump
+    points only.
+    """
+    free, width, source, target = _setup(grid, start, end)
+    tr, tc = divmod(target, width)
+    verticals = (width, -width)
+
+    def h(node):
+        r, c = divmod(node, width)
+        return abs(r - tr) + abs(c - tc)
+
+    def forced(node, d):
+        return [v for v in verticals if free[node + v] and not free[node - d + v]]
+
+    def jump_h(node, d):
+        while True:
+            node += d
+            if not free[node]:
+                return -1
+            if node == target or forced(node, d):
+                return node
+
+    def jump_v(node, d):
+        while True:
+            node += d
+            if not free[node]:
+                return -1
+            if node == target or jump_h(node, 1) >= 0 or jump_h(node, -1) >= 0:
+                return node
+
+    def directions(node, prev):
+        if prev == node:
+            return [1, -1, width, -width]
+        delta = node - prev
+        if abs(delta) < width:
+            d = 1 if delta > 0 else -1
+            return [d] + forced(node, d)
+        d = width if delta > 0 else -width
+        return [d, 1, -1]
+
+    came_from = {}
+    g_score = {}
+    closed = set()
+    heap = []
+    trace = [] if "order" in stats else None
+    expanded = peak = 0
+    if free[source]:
+        came_from[source] = source
+        g_score[source] = 0
+        heap.append((h(source), h(source), source))
+
+    while heap:
+        peak = max(peak, len(heap))
+        _, _, current = heapq.heappop(heap)
+        if current in closed:
+            continue
+        closed.add(current)
+        expanded += 1
+        if trace is not None:
+            trace.append(current - width - 1 - 2 * (current // width - 1))
+        if current == target:
+            break
+        for d in directions(current, came_from[current]):
+            if d in (1, -1):
+                point = jump_h(current, d)
+                step = abs(point - current)
+            else:
+                point = jump_v(current, d)
+                step = abs(point - current) // width
+            if point < 0:
+                continue
+            new_cost = g_score[current] + step
+            if new_cost < g_score.get(point, new_cost + 1):
+                g_score[point] = new_cost
+                came_from[point] = current
+                hp = h(point)
+                heapq.heappush(heap, (new_cost + hp, hp, point))
+
+    stats["expanded"] = expanded
+    stats["peak_frontier"] = peak
+    if trace is not None:
+        stats["order"].append(np.array(trace, dtype=np.int32))
+
+    # Expand jump-point links into cell-by-cell parents. A cell covered by
+    # several segments keeps the one giving it the lowest cost, so walking
+    # back from any cell strictly decreases cost and ends at the start.
+    cells = {}
+    best = {}
+    if source in came_from:
+        cells[source] = source
+        best[source] = 0
+    for node, prev in came_from.items():
+        if node == prev:
+            continue
+        d = node - prev
+        d = (1 if d > 0 else -1) if abs(d) < width else (width if d > 0 else -width)
+        cost = g_score[prev]
+        while prev != node:
+            cost += 1
+            if cost < best.get(prev + d, cost + 1):
+                best[prev + d] = cost
+                cells[prev + d] = prev
+            prev += d
+    return _to_visited(cells, width)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare maze solvers on one grid")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--density", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    grid = random_grid(args.rows, density=args.density, seed=args.seed)
+    end = (args.rows - 1, args.rows - 1)
+    print(f"{'solver':<14}{'expanded':>10}{'peak':>8}{'ms':>10}{'length':>8}")
+    for s in compare(grid, (0, 0), end):
+        print(f"{s.solver:<14}{s.expanded:>10}{s.peak_frontier:>8}"
+              f"{s.seconds * 1000:>10.1f}{s.path_length:>8}")
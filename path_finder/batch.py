@@ -0,0 +1,147 @@
+"""Headless batch routing: many (start, goal) pairs in, JSON lines out.
+
+    python path_finder/batch.py pairs.txt --graph graph_dir --method alt
+    printf 'A,G\\nJ,E\\n' | python path_finder/batch.py -
+
+Each input line holds a start and a goal name separated by a comma or
+whitespace. Pairs are solved on a process pool; every worker loads the
+network once in its initializer (memory-mapped, so the pages are shared)
+and results are written in input order as they complete:
+
+    {"start": "A", "goal": "G", "cost": 10, "path": ["A", "F", "G"], "expansions": 3}
+
+Without ``--graph`` the built-in city map from search.py is used.
+Unreachable goals get ``"cost": null`` and unknown names an ``"error"``.
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from search import a_star, graph, reconstruct
+
+_network = None  # per-worker state set by _init_worker()
+_router = None
+
+
+def _init_worker(graph_dir, method):
+    global _network, _router
+    _network, _router = load_router(graph_dir, method)
+
+
+def load_router(graph_dir=None, method="astar"):
+    """(network, router) where router(start, goal) -> (cost, path, expansions)
+
+    ``method`` is "astar" (Euclidean A*), "alt" or "ch"; the last two
+    need the tables written by preprocess.py inside ``graph_dir``.
+    """
+    if graph_dir is None:
+        if method != "astar":
+            raise ValueError(f"method {method!r} needs --graph")
+        return None, _astar_router(None)
+
+    from graph import CSRGraph
+    network = CSRGraph.load(graph_dir)
+    if method == "astar":
+        return network, _astar_router(network)
+    if method == "alt":
+        from preprocess import Landmarks
+        return network, _astar_router(Landmarks.load(os.path.join(graph_dir, "alt"), network))
+    if method == "ch":
+        from preprocess import ContractionHierarchy
+        ch = ContractionHierarchy.load(os.path.join(graph_dir, "ch"))
+
+        def route(start, goal):
+            cost, path = ch.query(start, goal)
+            return cost, path, ch.settled
+        return network, route
+    raise ValueError(f"unknown method {method!r}")
+
+
+def _astar_router(network):
+    def route(start, goal):
+        stats = {}
+        came_from, cost = a_star(start, goal, network, stats)
+        path = reconstruct(came_from, start, goal) if goal in came_from else []
+        return cost, path, stats["expansions"]
+    return route
+
+
+def solve_pair(pair):
+    """One JSON result line for a (start, goal) name pair"""
+    start, goal = pair
+    result = {"start": start, "goal": goal}
+    nodes = []
+    for name in pair:
+        try:
+            if _network is None:
+                if name not in graph:
+                    raise KeyError(name)
+                nodes.append(name)
+            else:
+                nodes.append(_network.node_id(name))
+        except (KeyError, ValueError):
+            result["error"] = f"unknown node {name!r}"
+            return json.dumps(result)
+
+    cost, path, expansions = _router(*nodes)
+    result["cost"] = None if cost == float("inf") else cost
+    if _network is not None:
+        path = [_network.node_name(node) for node in path]
+    result["path"] = path
+    result["expansions"] = expansions
+    return json.dumps(result)
+
+
+def read_pairs(lines):
+    for line in lines:
+        fields = line.replace(",", " ").split()
+        if len(fields) >= 2 and not line.lstrip().startswith("#"):
+            yield fields[0], fields[1]
+
+
+def run(pairs, out, graph_dir=None, method="astar", workers=None, chunksize=64):
+    """Solve ``pairs`` and write one JSON line each to ``out``, in order.
+
+    Pairs are read in windows so a huge input stream never sits in
+    memory all at once.
+    """
+    pairs = iter(pairs)
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        _init_worker(graph_dir, method)
+        for pair in pairs:
+            out.write(solve_pair(pair) + "\n")
+        return
+
+    # fail here with the real error, not as a BrokenProcessPool
+    load_router(graph_dir, method)
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(graph_dir, method)) as pool:
+        window = chunksize * workers * 4
+        while True:
+            batch = list(islice(pairs, window))
+            if not batch:
+                break
+            for line in pool.map(solve_pair, batch, chunksize=chunksize):
+                out.write(line + "\n")
+            out.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch route queries as JSON lines")
+    parser.add_argument("pairs", help="file of 'start,goal' lines, or - for stdin")
+    parser.add_argument("--graph", help="directory written by CSRGraph.save()")
+    parser.add_argument("--method", choices=("astar", "alt", "ch"), default="astar")
+    parser.add_argument("--workers", type=int, default=None, help="default: all cores")
+    parser.add_argument("--chunksize", type=int, default=64)
+    args = parser.parse_args()
+    if args.method != "astar" and args.graph is None:
+        parser.error(f"--method {args.method} needs --graph")
+
+    source = sys.stdin if args.pairs == "-" else open(args.pairs, encoding="utf-8")
+    with source:
+        run(read_pairs(source), sys.stdout, args.graph, args.method,
+            args.workers, args.chunksize)
@@ -0,0 +1,222 @@
+"""Compressed sparse row (CSR) road-graph backend with integer node ids.
+
+Nodes are numbered 0..N-1. The out-edges of node ``u`` are
+``indices[indptr[u]:indptr[u+1]]`` with matching ``weights``; ``coords``
+holds one (x, y) row per node. Graphs can be built from edge arrays,
+from the dict map in search.py or from CSV files. They can be saved as
+.npy files and loaded back memory-mapped, so a large network is paged
+in from disk instead of parsed again.
+
+    python path_finder/graph.py convert edges.csv out_dir --coords nodes.csv
+"""
+import argparse
+import csv
+import math
+import os
+from array import array
+
+import numpy as np
+
+
+class CSRGraph:
+    def __init__(self, indptr, indices, weights, coords=None, names=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.coords = coords
+        self.names = names
+        self._ids = None
+        if coords is not None:
+            self._xs = coords[:, 0]
+            self._ys = coords[:, 1]
+
+    @property
+    def num_nodes(self):
+        return len(self.indptr) - 1
+
+    @property
+    def num_edges(self):
+        return len(self.indices)
+
+    # -------------------------------
+    # Search interface (see search.py)
+    # -------------------------------
+    def neighbors(self, node):
+        """(neighbor, weight) pairs of one node, straight from the CSR slices"""
+        start, end = self.indptr[node], self.indptr[node + 1]
+        return zip(self.indices[start:end].tolist(), self.weights[start:end].tolist())
+
+    def heuristic(self, a, b):
+        """Euclidean distance between node coordinates (0 without coords)"""
+        if self.coords is None:
+            return 0.0
+        return math.hypot(self._xs[a] - self._xs[b], self._ys[a] - self._ys[b])
+
+    # -------------------------------
+    # Node names
+    # -------------------------------
+    def node_id(self, name):
+        if self.names is None:
+            node = int(name)
+            if not 0 <= node < self.num_nodes:
+                raise KeyError(name)
+            return node
+        if self._ids is None:
+            self._ids = {n: i for i, n in enumerate(self.names)}
+        return self._ids[name]
+
+    def node_name(self, node):
+        return str(node) if self.names is None else self.names[node]
+
+    def sources(self):
+        """Source node of every edge, aligned with ``indices``"""
+        return np.repeat(np.arange(self.num_nodes, dtype=np.int32), np.diff(self.indptr))
+
+    def reversed(self):
+        """The same graph with every edge flipped"""
+        return CSRGraph.from_edges(self.indices, self.sources(), self.weights,
+                                   self.num_nodes, self.coords, self.names)
+
+    # -------------------------------
+    # Construction
+    # -------------------------------
+    @classmethod
+    def from_edges(cls, src, dst, weight, num_nodes=None, coords=None, names=None,
+                   undirected=False):
+        """Build from parallel edge arrays; ``undirected`` adds reverse edges"""
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        weight = np.asarray(weight, dtype=np.float64)
+        if undirected:
+            src, dst = np.concatenate([src, dst]), np.concatenate([dst, src])
+            weight = np.concatenate([weight, weight])
+        if num_nodes is None:
+            num_nodes = int(max(src.max(initial=-1), dst.max(initial=-1))) + 1
+        order = np.argsort(src, kind="stable")
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=num_nodes), out=indptr[1:])
+        indices = dst[order].astype(np.int32)
+        if coords is not None:
+            coords = np.asarray(coords, dtype=np.float64)
+        return cls(indptr, indices, weight[order], coords, names)
+
+    @classmethod
+    def from_dict(cls, graph, coords=None):
+        """Convert a ``{name: {neighbor: weight}}`` map like search.graph"""
+        names = list(graph)
+        ids = {name: i for i, name in enumerate(names)}
+        src, dst, weight = [], [], []
+        for name, edges in graph.items():
+            for neighbor, w in edges.items():
+                src.append(ids[name])
+                dst.append(ids[neighbor])
+                weight.append(w)
+        xy = None if coords is None else [coords[name] for name in names]
+        return cls.from_edges(src, dst, weight, len(names), xy, names)
+
+    @classmethod
+    def load_csv(cls, edges_path, coords_path=None, undirected=False):
+        """Read ``u,v,weight`` rows (and optional ``name,x,y`` rows).
+
+        Node names are arbitrary strings; ids follow the coordinates file
+        first, then first appearance in the edge list. A header row is
+        skipped when its weight/x column is not a number.
+        """
+        ids = {}
+        names = []
+
+        def node(name):
+            i = ids.get(name)
+            if i is None:
+                i = ids[name] = len(names)
+                names.append(name)
+            return i
+
+        xs, ys = array("d"), array("d")
+        if coords_path is not None:
+            for name, x, y in _rows(coords_path):
+                node(name)
+                xs.append(float(x))
+                ys.append(y)
+
+        src, dst, weight = array("q"), array("q"), array("d")
+        for u, v, w in _rows(edges_path):
+            src.append(node(u))
+            dst.append(node(v))
+            weight.append(w)
+
+        coords = None
+        if coords_path is not None:
+            if len(xs) != len(names):
+                raise ValueError(f"{len(names) - len(xs)} nodes in {edges_path} "
+                                 f"have no coordinates in {coords_path}")
+            coords = np.column_stack([np.frombuffer(xs), np.frombuffer(ys)])
+        return cls.from_edges(np.frombuffer(src, dtype=np.int64),
+                              np.frombuffer(dst, dtype=np.int64),
+                              np.frombuffer(weight), len(names), coords, names,
+                              undirected)
+
+    # -------------------------------
+    # Binary storage
+    # -------------------------------
+    def save(self, directory):
+        """Write the arrays as .npy files (plus names.txt) into ``directory``"""
+        os.makedirs(directory, exist_ok=True)
+        for field in ("indptr", "indices", "weights", "coords"):
+            value = getattr(self, field)
+            if value is not None:
+                np.save(os.path.join(directory, field + ".npy"), value)
+        if self.names is not None:
+            with open(os.path.join(directory, "names.txt"), "w", encoding="utf-8") as f:
+                f.write("\n".join(self.names) + "\n")
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Load a saved graph; with ``mmap`` the arrays stay on disk"""
+        mode = "r" if mmap else None
+
+        def part(field, required=True):
+            path = os.path.join(directory, field + ".npy")
+            if os.path.exists(path):
+                return np.load(path, mmap_mode=mode)
+            if required:
+                raise FileNotFoundError(f"{directory}: no saved graph ({field}.npy missing)")
+            return None
+
+        names = None
+        names_path = os.path.join(directory, "names.txt")
+        if os.path.exists(names_path):
+            with open(names_path, encoding="utf-8") as f:
+                names = f.read().splitlines()
+        return cls(part("indptr"), part("indices"), part("weights"), part("coords", required=False), names)
+
+
+def _rows(path):
+    """(str, str, float) rows of a 3-column CSV file"""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        for i, row in enumerate(reader):
+            if not row:
+                continue
+            try:
+                last = float(row[2])
+            except ValueError:
+                if i == 0:
+                    continue  # header
+                raise
+            yield row[0].strip(), row[1].strip(), last
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Road graph tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    convert = sub.add_parser("convert", help="CSV edge list -> memory-mappable .npy files")
+    convert.add_argument("edges")
+    convert.add_argument("out")
+    convert.add_argument("--coords")
+    convert.add_argument("--undirected", action="store_true")
+    args = parser.parse_args()
+
+    g = CSRGraph.load_csv(args.edges, args.coords, args.undirected)
+    g.save(args.out)
+    print(f"{g.num_nodes} nodes, {g.num_edges} edges -> {args.out}")
@@ -0,0 +1,166 @@
+"""Many-to-many distance matrices and isochrones on a CSRGraph.
+
+``distance_matrix`` runs one Dijkstra per distinct source (or per
+distinct target on the reversed graph, whichever side is smaller) and
+stops each search once every target is settled. Sources can be spread
+over a process pool. Given a ``preprocess.ContractionHierarchy`` it uses
+bucket queries instead: one upward search per target fills per-node
+buckets, and one upward search per source scans them.
+
+``isochrone`` returns every node reachable within a cost budget.
+
+    python path_finder/matrix.py graph_dir --sources 200 --targets 200 --workers 4
+    python path_finder/matrix.py graph_dir --isochrone 17 --budget 40
+"""
+import argparse
+import heapq
+import math
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from graph import CSRGraph
+
+_network = None  # per-worker state set by _init_worker()
+_targets = None
+
+
+def one_to_all(network, source, targets=None, limit=math.inf):
+    """Dijkstra from ``source`` as {node: cost} of the settled nodes.
+
+    Stops once every node in ``targets`` is settled, or once the next
+    cost would exceed ``limit``.
+    """
+    remaining = None if targets is None else set(targets)
+    dist = {source: 0.0}
+    settled = {}
+    heap = [(0.0, source)]
+    while heap:
+        d, node = heapq.heappop(heap)
+        if node in settled:
+            continue
+        if d > limit:
+            break
+        settled[node] = d
+        if remaining is not None:
+            remaining.discard(node)
+            if not remaining:
+                break
+        for neighbor, weight in network.neighbors(node):
+            new_cost = d + weight
+            if new_cost < dist.get(neighbor, math.inf):
+                dist[neighbor] = new_cost
+                heapq.heappush(heap, (new_cost, neighbor))
+    return settled
+
+
+def _init_worker(network, targets):
+    """``network`` is a CSRGraph, or a directory to load one from (memory-mapped)"""
+    global _network, _targets
+    if isinstance(network, str):
+        network = CSRGraph.load(network)
+    _network, _targets = network, targets
+
+
+def _row(source):
+    settled = one_to_all(_network, source, _targets)
+    return [settled.get(t, math.inf) for t in _targets]
+
+
+def distance_matrix(network, sources, targets, workers=1, ch=None):
+    """(len(sources), len(targets)) float64 costs, inf where unreachable"""
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    # duplicated ids share one search; the row/column is copied back
+    src, src_inverse = np.unique(sources, return_inverse=True)
+    tgt, tgt_inverse = np.unique(targets, return_inverse=True)
+
+    if ch is not None:
+        result = _bucket_matrix(ch, src.tolist(), tgt.tolist())
+    elif len(tgt) < len(src):
+        # fewer targets: search backwards from each on the reversed graph
+        result = _search_rows(network.reversed(), tgt.tolist(), src.tolist(), workers).T
+    else:
+        result = _search_rows(network, src.tolist(), tgt.tolist(), workers)
+    return result[src_inverse][:, tgt_inverse]
+
+
+def _search_rows(network, sources, targets, workers):
+    if workers == 1:
+        _init_worker(network, targets)
+        rows = [_row(s) for s in sources]
+    else:
+        # workers map the arrays from disk instead of each unpickling a copy
+        chunksize = max(1, len(sources) // (4 * (workers or os.cpu_count())))
+        with tempfile.TemporaryDirectory(prefix="matrix-") as directory:
+            network.save(directory)
+            with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                     initargs=(directory, targets)) as pool:
+                rows = list(pool.map(_row, sources, chunksize=chunksize))
+    return np.array(rows, dtype=np.float64).reshape(len(sources), len(targets))
+
+
+def _bucket_matrix(ch, sources, targets):
+    buckets = {}
+    for j, target in enumerate(targets):
+        for node, d in ch.search_space(target, backward=True).items():
+            buckets.setdefault(node, []).append((j, d))
+    result = np.full((len(sources), len(targets)), math.inf)
+    for i, source in enumerate(sources):
+        row = result[i].tolist()
+        for node, d in ch.search_space(source).items():
+            for j, dt in buckets.get(node, ()):
+                if d + dt < row[j]:
+                    row[j] = d + dt
+        result[i] = row
+    return result
+
+
+def isochrone(network, source, budget, reverse=False):
+    """(nodes, costs) within ``budget`` of ``source``, sorted by cost.
+
+    With ``reverse`` the costs are *to* ``source`` instead of from it.
+    """
+    if reverse:
+        network = network.reversed()
+    settled = one_to_all(network, source, limit=budget)
+    nodes = np.fromiter(settled.keys(), dtype=np.int32, count=len(settled))
+    costs = np.fromiter(settled.values(), dtype=np.float64, count=len(settled))
+    return nodes, costs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distance matrices and isochrones")
+    parser.add_argument("graph", help="directory written by CSRGraph.save()")
+    parser.add_argument("--sources", type=int, default=100, help="random source count")
+    parser.add_argument("--targets", type=int, default=100, help="random target count")
+    parser.add_argument("--workers", type=int, default=1, help="0 for all cores")
+    parser.add_argument("--ch", action="store_true",
+                        help="use the hierarchy saved by preprocess.py --ch")
+    parser.add_argument("--isochrone", type=int, metavar="NODE")
+    parser.add_argument("--budget", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    network = CSRGraph.load(args.graph)
+    if args.isochrone is not None:
+        nodes, costs = isochrone(network, args.isochrone, args.budget)
+        print(f"{len(nodes)} nodes within {args.budget} of {network.node_name(args.isochrone)}")
+    else:
+        ch = None
+        if args.ch:
+            from preprocess import ContractionHierarchy
+            ch = ContractionHierarchy.load(os.path.join(args.graph, "ch"))
+        rng = random.Random(args.seed)
+        sources = [rng.randrange(network.num_nodes) for _ in range(args.sources)]
+        targets = [rng.randrange(network.num_nodes) for _ in range(args.targets)]
+        t0 = time.perf_counter()
+        result = distance_matrix(network, sources, targets, args.workers or None, ch)
+        seconds = time.perf_counter() - t0
+        reachable = np.isfinite(result)
+        print(f"{result.shape[0]}x{result.shape[1]} matrix in {seconds:.2f} s, "
+              f"{reachable.mean():.0%} reachable, mean cost {result[reachable].mean():.1f}")
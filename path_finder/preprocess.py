@@ -0,0 +1,379 @@
+"""Offline preprocessing for point-to-point queries on a static network.
+
+* ``Landmarks`` (ALT: A*, landmarks, triangle inequality) stores exact
+  distances from and to a few landmark nodes. The triangle inequality
+  turns them into a lower bound that is far tighter than straight-line
+  distance on real road weights. Pass it to ``search.a_star`` as the
+  network: it forwards ``neighbors`` and supplies ``heuristic``.
+* ``ContractionHierarchy`` contracts nodes one by one, adding shortcut
+  edges, and answers queries with a bidirectional Dijkstra that only
+  walks upward in the hierarchy.
+
+Both are saved as .npy files next to the graph and memory-mapped at
+startup:
+
+    python path_finder/preprocess.py graph_dir --landmarks 16 --ch --check 100
+"""
+import argparse
+import heapq
+import math
+import os
+import random
+import time
+
+import numpy as np
+
+from graph import CSRGraph
+from search import a_star
+
+# stands in for "unreachable" in landmark tables so differences stay finite
+FAR = 1e300
+
+
+def shortest_distances(network, source):
+    """One-to-all Dijkstra as a float64 array (inf where unreachable)"""
+    dist = [math.inf] * network.num_nodes
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        d, node = heapq.heappop(heap)
+        if d > dist[node]:
+            continue
+        for neighbor, weight in network.neighbors(node):
+            new_cost = d + weight
+            if new_cost < dist[neighbor]:
+                dist[neighbor] = new_cost
+                heapq.heappush(heap, (new_cost, neighbor))
+    return np.array(dist)
+
+
+# -------------------------------
+# ALT landmarks
+# -------------------------------
+class Landmarks:
+    def __init__(self, network, nodes, dist_from, dist_to):
+        self.network = network
+        self.nodes = nodes
+        self.dist_from = dist_from  # (N, L): d(landmark, v)
+        self.dist_to = dist_to      # (N, L): d(v, landmark)
+        self._goal = None
+
+    @classmethod
+    def build(cls, network, count=16, seed=0):
+        """Pick landmarks by farthest-point selection and run 2 Dijkstras each"""
+        reverse = network.reversed()
+        start = random.Random(seed).randrange(network.num_nodes)
+        d = shortest_distances(network, start)
+        candidate = int(np.argmax(np.where(np.isfinite(d), d, -1)))
+        nearest = np.full(network.num_nodes, math.inf)
+        nodes, froms, tos = [], [], []
+        for _ in range(count):
+            nodes.append(candidate)
+            froms.append(shortest_distances(network, candidate))
+            tos.append(shortest_distances(reverse, candidate))
+            nearest = np.minimum(nearest, froms[-1])
+            # next: the reachable node farthest from every chosen landmark
+            score = np.where(np.isfinite(nearest), nearest, -1)
+            candidate = int(np.argmax(score))
+            if score[candidate] <= 0:
+                break
+        dist_from = np.column_stack(froms)
+        dist_to = np.column_stack(tos)
+        dist_from[~np.isfinite(dist_from)] = FAR
+        dist_to[~np.isfinite(dist_to)] = FAR
+        return cls(network, np.array(nodes, dtype=np.int32), dist_from, dist_to)
+
+    def neighbors(self, node):
+        return self.network.neighbors(node)
+
+    def heuristic(self, node, goal):
+        """max over landmarks of d(L,t)-d(L,v) and d(v,L)-d(t,L), at least 0"""
+        if goal != self._goal:
+            self._goal = goal
+            self._from_goal = np.asarray(self.dist_from[goal])
+            self._to_goal = np.asarray(self.dist_to[goal])
+        return max(0.0, float((self._from_goal - self.dist_from[node]).max()),
+                   float((self.dist_to[node] - self._to_goal).max()))
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for field in ("nodes", "dist_from", "dist_to"):
+            np.save(os.path.join(directory, field + ".npy"), getattr(self, field))
+
+    @classmethod
+    def load(cls, directory, network, mmap=True):
+        mode = "r" if mmap else None
+        parts = [np.load(os.path.join(directory, field + ".npy"), mmap_mode=mode)
+                 for field in ("nodes", "dist_from", "dist_to")]
+        return cls(network, *parts)
+
+
+# -------------------------------
+# Contraction hierarchy
+# -------------------------------
+class ContractionHierarchy:
+    """Upward/downward CSR graphs; ``middle`` is the bypassed node or -1.
+
+    ``up`` holds edges u->v of the original graph (shortcuts included)
+    with rank[v] > rank[u]. ``down`` holds original edges u->v with
+    rank[u] > rank[v], stored reversed as v->u for the backward search.
+    """
+
+    def __init__(self, rank, up, down):
+        self.rank = rank
+        self.up = up      # (indptr, indices, weights, middle)
+        self.down = down
+        self.settled = 0  # nodes settled by the last query
+
+    @classmethod
+    def build(cls, network, settle_limit=60):
+        n = network.num_nodes
+        out_adj = [dict() for _ in range(n)]
+        in_adj = [dict() for _ in range(n)]
+        for u, v, w in zip(network.sources().tolist(), network.indices.tolist(),
+                           network.weights.tolist()):
+            if u != v and w < out_adj[u].get(v, math.inf):
+                out_adj[u][v] = w
+                in_adj[v][u] = w
+        middle = {}
+        contracted = bytearray(n)
+        depth = [0] * n
+
+        def witness(source, skip, limit):
+            dist = {source: 0.0}
+            heap = [(0.0, source)]
+            settled = 0
+            while heap:
+                d, node = heapq.heappop(heap)
+                if d > dist[node]:
+                    continue
+                settled += 1
+                if d > limit or settled > settle_limit:
+                    break
+                for nxt, w in out_adj[node].items():
+                    if nxt != skip and d + w < dist.get(nxt, math.inf):
+                        dist[nxt] = d + w
+                        heapq.heappush(heap, (d + w, nxt))
+            return dist
+
+        def shortcuts(v):
+            """Shortcuts contracting v would need (no witness path found)"""
+            found = []
+            if not in_adj[v] or not out_adj[v]:
+                return found
+            longest = max(out_adj[v].values())
+            for u, wu in in_adj[v].items():
+                dist = witness(u, v, wu + longest)
+                for x, wx in out_adj[v].items():
+                    if x != u and dist.get(x, math.inf) > wu + wx:
+                        found.append((u, x, wu + wx))
+            return found
+
+        def priority(v):
+            removed = len(in_adj[v]) + len(out_adj[v])
+            return len(shortcuts(v)) - removed + depth[v]
+
+        rank = np.zeros(n, dtype=np.int32)
+        up_edges, down_edges = [], []
+        heap = [(priority(v), v) for v in range(n)]
+        heapq.heapify(heap)
+        order = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            if contracted[v]:
+                continue
+            # lazy update: re-queue if v is no longer the cheapest choice
+            p = priority(v)
+            if heap and p > heap[0][0]:
+                heapq.heappush(heap, (p, v))
+                continue
+            for u, x, w in shortcuts(v):
+                if w < out_adj[u].get(x, math.inf):
+                    out_adj[u][x] = w
+                    in_adj[x][u] = w
+                    middle[u, x] = v
+            # v's remaining edges all lead to nodes contracted later
+            for x, w in out_adj[v].items():
+                up_edges.append((v, x, w, middle.get((v, x), -1)))
+                del in_adj[x][v]
+                depth[x] = max(depth[x], depth[v] + 1)
+            for u, w in in_adj[v].items():
+                down_edges.append((v, u, w, middle.get((u, v), -1)))
+                del out_adj[u][v]
+                depth[u] = max(depth[u], depth[v] + 1)
+            out_adj[v] = {}
+            in_adj[v] = {}
+            contracted[v] = 1
+            rank[v] = order
+            order += 1
+        return cls(rank, _csr(up_edges, n), _csr(down_edges, n))
+
+    def query(self, start, goal):
+        """(cost, path) via bidirectional upward Dijkstra; (inf, []) if unreachable"""
+        dists = ({start: 0.0}, {goal: 0.0})
+        parents = ({start: None}, {goal: None})
+        heaps = ([(0.0, start)], [(0.0, goal)])
+        graphs = (self.up, self.down)
+        best, meet = math.inf, None
+        settled = 0
+        while heaps[0] or heaps[1]:
+            tops = [h[0][0] if h else math.inf for h in heaps]
+            if min(tops) >= best:
+                break
+            side = 0 if tops[0] <= tops[1] else 1
+            d, node = heapq.heappop(heaps[side])
+            dist = dists[side]
+            if d > dist[node]:
+                continue
+            settled += 1
+            other = dists[1 - side].get(node)
+            if other is not None and d + other < best:
+                best, meet = d + other, node
+            indptr, indices, weights, _ = graphs[side]
+            lo, hi = indptr[node], indptr[node + 1]
+            for nxt, w in zip(indices[lo:hi].tolist(), weights[lo:hi].tolist()):
+                if d + w < dist.get(nxt, math.inf):
+                    dist[nxt] = d + w
+                    parents[side][nxt] = node
+                    heapq.heappush(heaps[side], (d + w, nxt))
+        self.settled = settled
+        if meet is None:
+            return math.inf, []
+
+        # hierarchy path: start .. meet .. goal, then unpack shortcuts
+        hops = []
+        node = meet
+        while node is not None:
+            hops.append(node)
+            node = parents[0][node]
+        hops.reverse()
+        node = parents[1][meet]
+        while node is not None:
+            hops.append(node)
+            node = parents[1][node]
+        path = [start]
+        for a, b in zip(hops, hops[1:]):
+            path.extend(self._unpack(a, b))
+        return best, path
+
+    def search_space(self, node, backward=False):
+        """{node: cost} of a full upward search from ``node``.
+
+        Costs are upper bounds for nodes off the shortest paths, but the
+        minimum over meeting nodes of forward + backward cost is exact,
+        which is what many-to-many bucket queries rely on.
+        """
+        indptr, indices, weights, _ = self.down if backward else self.up
+        dist = {node: 0.0}
+        heap = [(0.0, node)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            lo, hi = indptr[u], indptr[u + 1]
+            for nxt, w in zip(indices[lo:hi].tolist(), weights[lo:hi].tolist()):
+                if d + w < dist.get(nxt, math.inf):
+                    dist[nxt] = d + w
+                    heapq.heappush(heap, (d + w, nxt))
+        return dist
+
+    def _middle(self, a, b):
+        """Bypassed node of the hierarchy edge a->b, or -1 for a real edge"""
+        if self.rank[b] > self.rank[a]:
+            indptr, indices, weights, middle = self.up
+            node, target = a, b
+        else:
+            indptr, indices, weights, middle = self.down
+            node, target = b, a
+        lo, hi = indptr[node], indptr[node + 1]
+        return int(middle[lo + int(np.flatnonzero(indices[lo:hi] == target)[0])])
+
+    def _unpack(self, a, b):
+        """Original nodes after ``a`` on the hierarchy edge a->b"""
+        out = []
+        stack = [(a, b)]
+        while stack:
+            u, v = stack.pop()
+            m = self._middle(u, v)
+            if m < 0:
+                out.append(v)
+            else:
+                stack.append((m, v))
+                stack.append((u, m))
+        return out
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "rank.npy"), self.rank)
+        for name in ("up", "down"):
+            for field, value in zip(("indptr", "indices", "weights", "middle"),
+                                    getattr(self, name)):
+                np.save(os.path.join(directory, f"{name}_{field}.npy"), value)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        mode = "r" if mmap else None
+
+        def part(name):
+            return np.load(os.path.join(directory, name + ".npy"), mmap_mode=mode)
+
+        fields = ("indptr", "indices", "weights", "middle")
+        return cls(part("rank"),
+                   tuple(part(f"up_{f}") for f in fields),
+                   tuple(part(f"down_{f}") for f in fields))
+
+
+def _csr(edges, n):
+    """(indptr, indices, weights, middle) arrays from (src, dst, w, mid) tuples"""
+    if edges:
+        src, dst, weight, mid = (np.array(col) for col in zip(*edges))
+    else:
+        src = dst = mid = np.empty(0, dtype=np.int64)
+        weight = np.empty(0)
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return (indptr, dst[order].astype(np.int32), weight[order].astype(np.float64),
+            mid[order].astype(np.int32))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build ALT tables and a contraction hierarchy")
+    parser.add_argument("graph", help="directory written by CSRGraph.save()")
+    parser.add_argument("--landmarks", type=int, default=16, help="0 to skip ALT")
+    parser.add_argument("--ch", action="store_true", help="also build a contraction hierarchy")
+    parser.add_argument("--check", type=int, default=0,
+                        help="compare N random queries against plain a_star")
+    args = parser.parse_args()
+
+    network = CSRGraph.load(args.graph)
+    alt = ch = None
+    if args.landmarks:
+        t0 = time.perf_counter()
+        alt = Landmarks.build(network, args.landmarks)
+        alt.save(os.path.join(args.graph, "alt"))
+        print(f"ALT: {len(alt.nodes)} landmarks in {time.perf_counter() - t0:.1f} s")
+    if args.ch:
+        t0 = time.perf_counter()
+        ch = ContractionHierarchy.build(network)
+        ch.save(os.path.join(args.graph, "ch"))
+        print(f"CH: {len(ch.up[1]) + len(ch.down[1])} edges in {time.perf_counter() - t0:.1f} s")
+
+    rng = random.Random(1)
+    totals = {"a_star": 0, "alt": 0, "ch": 0}
+    for _ in range(args.check):
+        start, goal = rng.randrange(network.num_nodes), rng.randrange(network.num_nodes)
+        stats = {}
+        _, cost = a_star(start, goal, network, stats)
+        totals["a_star"] += stats["expansions"]
+        if alt is not None:
+            _, alt_cost = a_star(start, goal, alt, stats)
+            totals["alt"] += stats["expansions"]
+            assert math.isclose(alt_cost, cost) or alt_cost == cost, (start, goal)
+        if ch is not None:
+            ch_cost, _ = ch.query(start, goal)
+            totals["ch"] += ch.settled
+            assert math.isclose(ch_cost, cost) or ch_cost == cost, (start, goal)
+    if args.check:
+        print("same costs on all queries; mean expansions:",
+              ", ".join(f"{k} {v / args.check:.1f}" for k, v in totals.items() if v))
@@ -0,0 +1,170 @@
+"""Route search core: the sample city map and the search algorithms.
+
+Every search takes an optional ``network``. Left as None it runs on the
+built-in ``graph``/``coords`` dicts below; otherwise it can be any object
+with ``neighbors(node)`` yielding ``(neighbor, weight)`` pairs and
+``heuristic(a, b)``, such as ``graph.CSRGraph`` with integer node ids.
+"""
+import heapq
+import math
+
+# -------------------------------
+# Graph setup with more cities
+# -------------------------------
+graph = {
+    'A': {'B': 6, 'F': 3},
+    'B': {'A': 6, 'C': 3, 'D': 2},
+    'C': {'B': 3, 'D': 1, 'E': 5},
+    'D': {'B': 2, 'C': 1, 'E': 8, 'H': 4},
+    'E': {'C': 5, 'D': 8, 'G': 5, 'I': 7},
+    'F': {'A': 3, 'G': 7, 'J': 4},
+    'G': {'E': 5, 'F': 7, 'I': 3},
+    'H': {'D': 4, 'I': 4},
+    'I': {'E': 7, 'G': 3, 'H': 4, 'J': 6},
+    'J': {'F': 4, 'I': 6}
+}
+
+# Coordinates for visualization (city positions)
+coords = {
+    'A': (0, 0),
+    'B': (2, 3),
+    'C': (4, 4),
+    'D': (6, 2),
+    'E': (8, 3),
+    'F': (1, -2),
+    'G': (10, 0),
+    'H': (7, 5),
+    'I': (10, 4),
+    'J': (3, -3)
+}
+
+# -------------------------------
+# Heuristic Function
+# -------------------------------
+def heuristic(a, b):
+    """Euclidean distance heuristic"""
+    (x1, y1), (x2, y2) = coords[a], coords[b]
+    return math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
+
+
+def _interface(network):
+    """(neighbors, heuristic) callables for the dict map or a backend"""
+    if network is None:
+        return (lambda node: graph[node].items()), heuristic
+    return network.neighbors, network.heuristic
+
+# -------------------------------
+# Best-First Search
+# -------------------------------
+def best_first_search(start, goal, network=None, stats=None):
+    """Greedy best-first search; a node's parent is fixed when first seen"""
+    neighbors, h = _interface(network)
+    open_list = []
+    heapq.heappush(open_list, (h(start, goal), start))
+    came_from = {start: None}
+    visited = set()
+    expansions, pushes = 0, 1
+
+    while open_list:
+        _, current = heapq.heappop(open_list)
+        if current in visited:
+            continue
+        if current == goal:
+            break
+        visited.add(current)
+        expansions += 1
+        for neighbor, _ in neighbors(current):
+            if neighbor not in came_from:
+                came_from[neighbor] = current
+                heapq.heappush(open_list, (h(neighbor, goal), neighbor))
+                pushes += 1
+    if stats is not None:
+        stats["expansions"] = expansions
+        stats["pushes"] = pushes
+    return came_from
+
+# -------------------------------
+# A* Search
+# -------------------------------
+def a_star(start, goal, network=None, stats=None):
+    """A* with a closed set and lazy deletion of stale heap entries.
+
+    Heap entries are ``(f, h, g, node)`` so ties on f go to the node
+    closest to the goal. An entry whose g is worse than the node's best
+    known g is skipped on pop. A closed node is reopened only if a
+    cheaper route to it turns up, which happens with inconsistent
+    heuristics only. ``stats`` receives ``expansions`` and ``pushes``.
+    """
+    neighbors, h = _interface(network)
+    h_start = h(start, goal)
+    open_list = [(h_start, h_start, 0, start)]
+    came_from = {start: None}
+    g_score = {start: 0}
+    closed = set()
+    expansions, pushes = 0, 1
+
+    while open_list:
+        _, _, cost, current = heapq.heappop(open_list)
+        if current in closed or cost > g_score[current]:
+            continue
+        closed.add(current)
+        expansions += 1
+        if current == goal:
+            break
+        for neighbor, weight in neighbors(current):
+            new_cost = cost + weight
+            if new_cost < g_score.get(neighbor, math.inf):
+                g_score[neighbor] = new_cost
+                came_from[neighbor] = current
+                closed.discard(neighbor)
+                h_n = h(neighbor, goal)
+                heapq.heappush(open_list, (new_cost + h_n, h_n, new_cost, neighbor))
+                pushes += 1
+    if stats is not None:
+        stats["expansions"] = expansions
+        stats["pushes"] = pushes
+    return came_from, g_score.get(goal, float('inf'))
+
+# -------------------------------
+# Dijkstra (reference)
+# -------------------------------
+def dijkstra(start, goal=None, network=None, stats=None):
+    """Plain Dijkstra; stops at ``goal`` if given. Returns (came_from, dist)"""
+    neighbors, _ = _interface(network)
+    open_list = [(0, start)]
+    came_from = {start: None}
+    dist = {start: 0}
+    done = set()
+    expansions, pushes = 0, 1
+
+    while open_list:
+        cost, current = heapq.heappop(open_list)
+        if current in done:
+            continue
+        done.add(current)
+        expansions += 1
+        if current == goal:
+            break
+        for neighbor, weight in neighbors(current):
+            new_cost = cost + weight
+            if new_cost < dist.get(neighbor, math.inf):
+                dist[neighbor] = new_cost
+                came_from[neighbor] = current
+                heapq.heappush(open_list, (new_cost, neighbor))
+                pushes += 1
+    if stats is not None:
+        stats["expansions"] = expansions
+        stats["pushes"] = pushes
+    return came_from, dist
+
+# -------------------------------
+# Path Reconstruction
+# -------------------------------
+def reconstruct(came_from, start, goal):
+    node = goal
+    path = []
+    while node is not None:
+        path.append(node)
+        node = came_from.get(node)
+    path.reverse()
+    return path
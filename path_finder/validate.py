@@ -0,0 +1,70 @@
+"""Check a_star() against Dijkstra on randomized road-like graphs.
+
+    python path_finder/validate.py --graphs 50 --nodes 300
+
+Nodes are random points in a square. Each node links to a few random
+nearby nodes, with weight = Euclidean length x a detour factor >= 1, so
+the Euclidean heuristic is consistent and A* must match Dijkstra's cost
+exactly. The script reports expansions and heap pushes for both and
+exits non-zero on the first cost mismatch.
+"""
+import argparse
+import math
+import random
+
+import numpy as np
+
+from graph import CSRGraph
+from search import a_star, dijkstra
+
+
+def random_road_graph(nodes, degree, rng):
+    xy = [(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(nodes)]
+    src, dst, weight = [], [], []
+    for u in range(nodes):
+        # candidates biased toward close nodes, like a road network
+        near = sorted(rng.sample(range(nodes), min(nodes, 4 * degree)),
+                      key=lambda v: math.dist(xy[u], xy[v]))
+        for v in near[1:degree + 1]:
+            if v != u:
+                src.append(u)
+                dst.append(v)
+                weight.append(math.dist(xy[u], xy[v]) * rng.uniform(1.0, 1.6))
+    return CSRGraph.from_edges(src, dst, weight, nodes, np.array(xy), undirected=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--graphs", type=int, default=30)
+    parser.add_argument("--nodes", type=int, default=300)
+    parser.add_argument("--degree", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=20, help="queries per graph")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    totals = {"a_star": [0, 0], "dijkstra": [0, 0]}
+    checked = 0
+    for _ in range(args.graphs):
+        g = random_road_graph(args.nodes, args.degree, rng)
+        for _ in range(args.queries):
+            start, goal = rng.randrange(args.nodes), rng.randrange(args.nodes)
+            a_stats, d_stats = {}, {}
+            _, cost = a_star(start, goal, g, a_stats)
+            _, dist = dijkstra(start, goal, g, d_stats)
+            expected = dist.get(goal, math.inf)
+            if not (cost == expected or math.isclose(cost, expected)):
+                raise SystemExit(f"mismatch {start}->{goal}: a_star {cost}, dijkstra {expected}")
+            for name, stats in (("a_star", a_stats), ("dijkstra", d_stats)):
+                totals[name][0] += stats["expansions"]
+                totals[name][1] += stats["pushes"]
+            checked += 1
+
+    print(f"{checked} queries on {args.graphs} graphs: all costs match")
+    for name, (expansions, pushes) in totals.items():
+        print(f"{name:<9} mean expansions {expansions / checked:8.1f}  "
+              f"mean heap pushes {pushes / checked:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,23 @@
-import pygame
-import random
+import time
+
+STARTED = time.perf_counter()
+
+import argparse
+import os
 import sys
 
+import pygame
+
+from assets import AssetManager, default_cache_dir
+from render import Atlas, Renderer, TextCache
+from replay import SEEDS, Recorder, seed_arg
+from world import (World, WIDTH, HEIGHT, TICK, LEFT, RIGHT, FIRE,
+                   PLAYER_WIDTH, PLAYER_HEIGHT, ENEMY_WIDTH, ENEMY_HEIGHT)
+
 pygame.init()
 pygame.mixer.init()  # Initialize mixer for sound
 
 # Screen settings
-WIDTH, HEIGHT = 600, 800
 SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Space Shooter Game")
 
@@ -14,234 +25,214 @@ pygame.display.set_caption("Space Shooter Game")
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 
-# Clock
+# Clock: caps the render rate; the simulation runs at world.TICK_RATE
 clock = pygame.time.Clock()
 FPS = 60
-
-# Player
-player_width, player_height = 50, 50
-player_speed = 7
-player_lives = 5
-
-# Bullets
-bullet_speed = 10
-enemy_bullet_speed = 7
-bullet_cooldown_max = 12
-
-# Enemies
-enemy_width, enemy_height = 50, 50
-
-# Power-ups
-powerup_speed = 3
-powerup_chance = 0.2
-
-# Load images
-player_img = pygame.image.load("images/space_rocket.png")
-player_img = pygame.transform.scale(player_img, (player_width, player_height))
-
-enemy_img = pygame.image.load("images/rocket.png")
-enemy_img = pygame.transform.scale(enemy_img, (enemy_width, enemy_height))
-
-bullet_img = pygame.image.load("images/bullet.png")
-bullet_img = pygame.transform.scale(bullet_img, (10, 20))
-
-enemy_bullet_img = pygame.image.load("images/bullet2.png")
-enemy_bullet_img = pygame.transform.scale(enemy_bullet_img, (10, 20))
-enemy_bullet_img = pygame.transform.rotate(enemy_bullet_img, -90)
-
-powerup_img = pygame.image.load("images/booster.png")
-powerup_img = pygame.transform.scale(powerup_img, (30, 30))
-
-# Load sounds
-pygame.mixer.music.load("music/track.mp3")
-pygame.mixer.music.set_volume(0.5)
-pygame.mixer.music.play(-1)
-
-bullet_sound = pygame.mixer.Sound("music/laser1.mp3")
-bullet_sound.set_volume(0.5)
-
-enemy_hit_sound = pygame.mixer.Sound("music/laser2.mp3")
-enemy_hit_sound.set_volume(0.5)
-
-powerup_sound = pygame.mixer.Sound("music/laser2.mp3")
-powerup_sound.set_volume(0.5)
+MAX_FRAME = 0.25  # longest frame time we catch up on, in seconds
 
 # Font
 font = pygame.font.SysFont("comicsans", 30)
 
-# Game over screen
-def game_over_screen(score):
-    while True:
-        SCREEN.fill(BLACK)
-        over_text = font.render("GAME OVER", True, WHITE)
-        score_text = font.render(f"Score: {score}", True, WHITE)
-        restart_text = font.render("Press R to Restart or Q to Quit", True, WHITE)
-        SCREEN.blit(over_text, (WIDTH//2 - over_text.get_width()//2, HEIGHT//3))
-        SCREEN.blit(score_text, (WIDTH//2 - score_text.get_width()//2, HEIGHT//3 + 50))
-        SCREEN.blit(restart_text, (WIDTH//2 - restart_text.get_width()//2, HEIGHT//3 + 100))
-        pygame.display.update()
+# Assets: registered here, loaded in the background by load_assets()
+assets = AssetManager(default_cache_dir())
+SPRITE_KEYS = {
+    "player": assets.image("images/space_rocket.png", (PLAYER_WIDTH, PLAYER_HEIGHT)),
+    "enemy": assets.image("images/rocket.png", (ENEMY_WIDTH, ENEMY_HEIGHT)),
+    "bullet": assets.image("images/bullet.png", (10, 20)),
+    "enemy_bullet": assets.image("images/bullet2.png", (10, 20), -90),
+    "powerup": assets.image("images/booster.png", (30, 30)),
+}
+SOUND_KEYS = {
+    "shot": assets.sound("music/laser1.mp3", 0.5),
+    "hit": assets.sound("music/laser2.mp3", 0.5),
+    "powerup": assets.sound("music/laser2.mp3", 0.5),  # same key: decoded once
+}
+SOUNDS = {}
+renderer = None
+
+
+def loading_screen(progress):
+    SCREEN.fill(BLACK)
+    text = font.render("Loading...", True, WHITE)
+    SCREEN.blit(text, (WIDTH//2 - text.get_width()//2, HEIGHT//2 - 60))
+    bar = pygame.Rect(WIDTH//4, HEIGHT//2, WIDTH//2, 20)
+    pygame.draw.rect(SCREEN, WHITE, bar, 2)
+    pygame.draw.rect(SCREEN, WHITE, (bar.x, bar.y, int(bar.w * progress), bar.h))
+    pygame.display.update()
+
+
+def load_assets(report=False):
+    """Load assets behind a loading screen, then build the render layer"""
+    global renderer
+    ready = time.perf_counter()
+    assets.start()
+    while not assets.done():
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_r:
-                    main()
-                if event.key == pygame.K_q:
-                    pygame.quit()
-                    sys.exit()
-
-# Main game
-def main():
-    player_x = WIDTH//2 - player_width//2
-    player_y = HEIGHT - player_height - 10
-    lives = player_lives
-
-    bullets = []
-    enemy_bullets = []
-    bullet_cooldown = 0
-    bullets_per_shot = 1
-    boost_timer = 0
-
-    enemies = []
-    enemy_speed = 3
-    spawn_timer = 0
-    enemy_spawn_rate = 30
-
-    powerups = []
-    score = 0
-    running = True
-
-    while running:
+        loading_screen(assets.progress())
+        clock.tick(30)
+    assets.wait()
+    assets.convert()
+
+    pygame.mixer.music.load("music/track.mp3")
+    pygame.mixer.music.set_volume(0.5)
+    pygame.mixer.music.play(-1)
+
+    # Render layer: every sprite converted once into one atlas, HUD text cached
+    atlas = Atlas({name: assets.get(key) for name, key in SPRITE_KEYS.items()})
+    renderer = Renderer(SCREEN, atlas, TextCache(font, WHITE), BLACK)
+    SOUNDS.update({name: assets.get(key) for name, key in SOUND_KEYS.items()})
+    if report:
+        now = time.perf_counter()
+        print(f"startup: init {(ready - STARTED) * 1000:.1f} ms, {assets.report()}, "
+              f"ready after {(now - STARTED) * 1000:.1f} ms")
+
+# -------------------------------
+# Scenes
+# -------------------------------
+# Each scene has enter() and frame(); frame() returns the name of the
+# next scene, "quit", or None to stay. One loop in main() drives them,
+# so restarting a game never nests calls or keeps old state alive.
+
+def draw_centered(lines):
+    """Draw a static text screen once; it stays up until the scene changes"""
+    SCREEN.fill(BLACK)
+    for i, text in enumerate(lines):
+        surface = font.render(text, True, WHITE)
+        SCREEN.blit(surface, (WIDTH//2 - surface.get_width()//2, HEIGHT//3 + 50 * i))
+    pygame.display.update()
+
+
+def wait_for_key(choices):
+    """Sleep until a key in ``choices`` (key -> scene name) or a quit"""
+    while True:
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT:
+            return "quit"
+        if event.type == pygame.KEYDOWN and event.key in choices:
+            return choices[event.key]
+
+
+class MenuScene:
+    def enter(self):
+        draw_centered(["SPACE SHOOTER", "Press SPACE to Start or Q to Quit"])
+
+    def frame(self):
+        return wait_for_key({pygame.K_SPACE: "playing", pygame.K_RETURN: "playing",
+                             pygame.K_q: "quit"})
+
+
+class GameOverScene:
+    def __init__(self, world):
+        self.world = world
+
+    def enter(self):
+        draw_centered(["GAME OVER", f"Score: {self.world.score}",
+                       "Press R to Restart or Q to Quit"])
+
+    def frame(self):
+        return wait_for_key({pygame.K_r: "playing", pygame.K_q: "quit"})
+
+
+def read_inputs():
+    keys = pygame.key.get_pressed()
+    return ((LEFT if keys[pygame.K_LEFT] else 0) | (RIGHT if keys[pygame.K_RIGHT] else 0)
+            | (FIRE if keys[pygame.K_SPACE] else 0))
+
+
+class PlayScene:
+    def __init__(self, world, seed=None, show_stats=False, record=None):
+        self.world = world
+        self.seed = seed
+        self.show_stats = show_stats
+        self.record = record  # replay path; game N is saved as <name>-N<ext>
+        self.recorder = None
+        self.games = 0
+
+    def enter(self):
+        # the same World and entity pools serve every game of the session
+        self.world.reset(self.seed)
+        if self.seed is not None:
+            self.seed = (self.seed + 1) % SEEDS
+        if self.record:
+            self.recorder = Recorder(self.world)
+        renderer.invalidate()
+        self.overlay = ()
+        self.frames = 0
+        self.lag = 0.0
+        self.previous = time.perf_counter()
+
+    def frame(self):
+        world, stats = self.world, renderer.stats
         clock.tick(FPS)
-        SCREEN.fill(BLACK)
-        keys = pygame.key.get_pressed()
-
-        # Player continuous firing
-        if keys[pygame.K_SPACE] and bullet_cooldown == 0:
-            for i in range(bullets_per_shot):
-                offset = i * 10 - (bullets_per_shot-1)*5
-                bullets.append([player_x + player_width//2 - 5 + offset, player_y])
-            bullet_cooldown = bullet_cooldown_max
-            bullet_sound.play()
-        if bullet_cooldown > 0:
-            bullet_cooldown -= 1
-
-        # Move bullets
-        for b in bullets[:]:
-            b[1] -= bullet_speed
-            if b[1] < 0:
-                bullets.remove(b)
-
-        # Spawn enemies
-        spawn_timer += 1
-        if spawn_timer > enemy_spawn_rate:
-            ex = random.randint(0, WIDTH - enemy_width)
-            enemies.append([ex, -enemy_height])
-            spawn_timer = 0
-
-        # Move enemies and fire bullets
-        for e in enemies[:]:
-            e[1] += enemy_speed
-            if random.random() < 0.02:
-                enemy_bullets.append([e[0]+enemy_width//2 - 5, e[1]+enemy_height])
-            if e[1] > HEIGHT:
-                enemies.remove(e)
-                lives -= 1
-                if lives <= 0:
-                    running = False
-
-        # Move enemy bullets
-        for eb in enemy_bullets[:]:
-            eb[1] += enemy_bullet_speed
-            if eb[1] > HEIGHT:
-                enemy_bullets.remove(eb)
-            # Collision with player
-            if player_x < eb[0] < player_x + player_width and player_y < eb[1] < player_y + player_height:
-                enemy_bullets.remove(eb)
-                lives -= 1
-                if lives <= 0:
-                    running = False
-            # Collision with player's bullets (cut bullets)
-            for b in bullets[:]:
-                if (b[0] > eb[0] and b[0] < eb[0]+10) and (b[1] > eb[1] and b[1] < eb[1]+20):
-                    bullets.remove(b)
-                    enemy_bullets.remove(eb)
-                    break
-
-        # Move power-ups
-        for p in powerups[:]:
-            p[1] += powerup_speed
-            if p[1] > HEIGHT:
-                powerups.remove(p)
-
-        # Collision detection (enemy hit)
-        for e in enemies[:]:
-            for b in bullets[:]:
-                if (b[0] > e[0] and b[0] < e[0]+enemy_width) and (b[1] > e[1] and b[1] < e[1]+enemy_height):
-                    enemies.remove(e)
-                    bullets.remove(b)
-                    score += 1
-                    enemy_hit_sound.play()
-                    if random.random() < powerup_chance and bullets_per_shot < 3:
-                        powerups.append([e[0]+10, e[1]+10])
-                    break
-
-        # Player collects power-ups
-        for p in powerups[:]:
-            if (player_x < p[0] < player_x + player_width) and (player_y < p[1] < player_y + player_height):
-                if bullets_per_shot < 3:
-                    bullets_per_shot += 1
-                boost_timer = 300
-                powerups.remove(p)
-                powerup_sound.play()
-
-        # Reduce boost timer
-        if bullets_per_shot > 1:
-            boost_timer -= 1
-            if boost_timer <= 0:
-                bullets_per_shot -= 1
-                boost_timer = 0
-
-        # Player movement
-        if keys[pygame.K_LEFT] and player_x > 0:
-            player_x -= player_speed
-        if keys[pygame.K_RIGHT] and player_x < WIDTH - player_width:
-            player_x += player_speed
-
-        # Difficulty increase
-        if score >= 10:
-            enemy_speed = 4
-            enemy_spawn_rate = 30
-        if score >= 20:
-            enemy_speed = 5
-            enemy_spawn_rate = 25
-        if score >= 30:
-            enemy_speed = 6
-            enemy_spawn_rate = 20
-
-        # Draw everything
-        SCREEN.blit(player_img, (player_x, player_y))
-        for b in bullets: SCREEN.blit(bullet_img, (b[0], b[1]))
-        for e in enemies: SCREEN.blit(enemy_img, (e[0], e[1]))
-        for eb in enemy_bullets: SCREEN.blit(enemy_bullet_img, (eb[0], eb[1]))
-        for p in powerups: SCREEN.blit(powerup_img, (p[0], p[1]))
-
-        score_text = font.render(f"Score: {score}", True, WHITE)
-        SCREEN.blit(score_text, (10, 10))
-        lives_text = font.render(f"Lives: {lives}", True, WHITE)
-        SCREEN.blit(lives_text, (10, 40))
-        power_text = font.render(f"Power Level: {bullets_per_shot}", True, WHITE)
-        SCREEN.blit(power_text, (10, 70))
+        now = time.perf_counter()
+        self.lag += min(now - self.previous, MAX_FRAME)
+        self.previous = now
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                return "quit"
+
+        # Fixed-timestep simulation: as many ticks as real time calls for
+        t0 = time.perf_counter()
+        inputs = read_inputs()
+        while self.lag >= TICK and not world.over:
+            world.step(inputs)
+            if self.recorder is not None:
+                self.recorder.tick(inputs)
+            self.lag -= TICK
+            for name in world.events:
+                SOUNDS[name].play()
+        t1 = time.perf_counter()
+
+        if self.show_stats and self.frames % 30 == 0:
+            self.overlay = tuple(stats.lines())  # refreshed twice a second, so it stays cached
+        self.frames += 1
+        dirty = renderer.draw(world, self.lag / TICK, self.overlay)
+        t2 = time.perf_counter()
+        pygame.display.update(dirty)
+        stats.add("update ms", (t1 - t0) * 1000)
+        stats.add("render ms", (t2 - t1) * 1000)
+        stats.add("present ms", (time.perf_counter() - t2) * 1000)
+        stats.end_frame()
+
+        if world.over:
+            if self.show_stats:
+                print(stats.summary())
+            if self.recorder is not None:
+                self.games += 1
+                root, ext = os.path.splitext(self.record)
+                self.recorder.save(f"{root}-{self.games}{ext}")
+            return "game_over"
+        return None
 
-        pygame.display.update()
 
-    game_over_screen(score)
+# Main game
+def main(seed=None, show_stats=False, record=None):
+    world = World(seed)
+    scenes = {"menu": MenuScene(), "playing": PlayScene(world, seed, show_stats, record),
+              "game_over": GameOverScene(world)}
+    scene = scenes["menu"]
+    scene.enter()
+    while True:
+        name = scene.frame()
+        if name == "quit":
+            break
+        if name is not None:
+            scene = scenes[name]
+            scene.enter()
+    pygame.quit()
 
 # Start game
-main()
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Space Shooter")
+    parser.add_argument("--seed", type=seed_arg, help="seed the game for a repeatable run")
+    parser.add_argument("--stats", action="store_true", help="report startup and per-frame timings")
+    parser.add_argument("--record", metavar="PATH",
+                        help="save each finished game as a replay (see replay.py): "
+                             "game.ssrp gives game-1.ssrp, game-2.ssrp, ...")
+    args = parser.parse_args()
+    load_assets(args.stats)
+    main(args.seed, args.stats, args.record)
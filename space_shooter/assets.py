@@ -0,0 +1,187 @@
+"""Asset loading for the shooter: deduplicated, threaded and disk-cached.
+
+Register every image and sound first. ``image()`` and ``sound()`` return
+a key, and the same file with the same parameters always yields the same
+key, so it is loaded once. A file used with different parameters is
+still decoded only once. ``start()`` then loads everything on a
+background thread while the caller draws a loading screen from
+``progress()``.
+
+Scaled and rotated images are stored in a cache directory as raw RGBA
+with a small header, and decoded sounds as raw samples in the mixer's
+format. The cache is keyed by path, parameters, file size and mtime, so
+a warm start reads the finished data back instead of decoding PNGs and
+MP3s and transforming them again. ``timings`` holds the seconds spent
+in each loading phase.
+"""
+import hashlib
+import os
+import struct
+import threading
+import time
+
+import pygame
+
+_HEADER = struct.Struct("<II")  # width, height of a cached RGBA image
+
+
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "space_shooter")
+
+
+class AssetManager:
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self.timings = {}
+        self.cache_hits = 0
+        self._keys = []
+        self._assets = {}
+        self._decoded = {}  # path -> decoded surface or sound, shared by variants
+        self._thread = None
+        self._error = None
+
+    # -------------------------------
+    # Registration
+    # -------------------------------
+    def image(self, path, size=None, angle=0):
+        """Key for ``path`` scaled to ``size`` then rotated by ``angle`` degrees"""
+        return self._register(("image", path, tuple(size) if size else None, angle))
+
+    def sound(self, path, volume=1.0):
+        return self._register(("sound", path, volume))
+
+    def _register(self, key):
+        if key not in self._keys:
+            if self._thread is not None:
+                raise RuntimeError("assets must be registered before start()")
+            self._keys.append(key)
+        return key
+
+    # -------------------------------
+    # Loading
+    # -------------------------------
+    def start(self):
+        """Load every registered asset on a background thread"""
+        self._thread = threading.Thread(target=self._load_all, name="assets", daemon=True)
+        self._thread.start()
+
+    def progress(self):
+        return len(self._assets) / len(self._keys) if self._keys else 1.0
+
+    def done(self):
+        return self._thread is not None and not self._thread.is_alive()
+
+    def wait(self):
+        """Block until loading ends; re-raise any loading error"""
+        if self._thread is None:
+            self.start()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def get(self, key):
+        return self._assets[key]
+
+    def convert(self):
+        """Convert images to the display format (main thread, after set_mode)"""
+        t0 = time.perf_counter()
+        for key in self._keys:
+            if key[0] == "image":
+                self._assets[key] = self._assets[key].convert_alpha()
+        self._add_time("convert", time.perf_counter() - t0)
+
+    def _add_time(self, phase, seconds):
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    def _load_all(self):
+        t0 = time.perf_counter()
+        try:
+            for key in self._keys:
+                if key[0] == "image":
+                    self._assets[key] = self._load_image(*key[1:])
+                else:
+                    self._assets[key] = self._load_sound(*key[1:])
+        except Exception as e:  # surfaced by wait()
+            self._error = e
+        self._decoded.clear()
+        self._add_time("total", time.perf_counter() - t0)
+
+    def _load_sound(self, path, volume):
+        t0 = time.perf_counter()
+        decoded = self._decoded.get(path)
+        if decoded is not None:
+            # the same file at another volume: copy the samples, the volume
+            # belongs to each Sound
+            sound = pygame.mixer.Sound(buffer=decoded.get_raw())
+            sound.set_volume(volume)
+            self._add_time("sound copy", time.perf_counter() - t0)
+            return sound
+        # decoded samples only match the mixer format they were made for
+        cache_path = self._cache_path(path, pygame.mixer.get_init(), "pcm")
+        if cache_path is not None and os.path.exists(cache_path):
+            with open(cache_path, "rb") as f:
+                sound = pygame.mixer.Sound(buffer=f.read())
+            self.cache_hits += 1
+            self._add_time("cache read", time.perf_counter() - t0)
+        else:
+            sound = pygame.mixer.Sound(path)
+            self._add_time("sound decode", time.perf_counter() - t0)
+            if cache_path is not None:
+                self._write_cache(cache_path, [sound.get_raw()])
+        self._decoded[path] = sound
+        sound.set_volume(volume)
+        return sound
+
+    def _write_cache(self, cache_path, chunks):
+        t0 = time.perf_counter()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp, cache_path)
+        self._add_time("cache write", time.perf_counter() - t0)
+
+    def _load_image(self, path, size, angle):
+        cache_path = self._cache_path(path, size, angle)
+        if cache_path is not None and os.path.exists(cache_path):
+            t0 = time.perf_counter()
+            with open(cache_path, "rb") as f:
+                data = f.read()
+            width, height = _HEADER.unpack_from(data)
+            surface = pygame.image.frombytes(data[_HEADER.size:], (width, height), "RGBA")
+            self.cache_hits += 1
+            self._add_time("cache read", time.perf_counter() - t0)
+            return surface
+
+        t0 = time.perf_counter()
+        surface = self._decoded.get(path)
+        if surface is None:
+            surface = self._decoded[path] = pygame.image.load(path)
+        t1 = time.perf_counter()
+        if size:
+            surface = pygame.transform.scale(surface, size)
+        if angle:
+            surface = pygame.transform.rotate(surface, angle)
+        t2 = time.perf_counter()
+        self._add_time("image decode", t1 - t0)
+        self._add_time("transform", t2 - t1)
+
+        if cache_path is not None:
+            self._write_cache(cache_path, [_HEADER.pack(*surface.get_size()),
+                                           pygame.image.tobytes(surface, "RGBA")])
+        return surface
+
+    def _cache_path(self, path, *params):
+        if self.cache_dir is None:
+            return None
+        st = os.stat(path)
+        token = repr((os.path.abspath(path), st.st_size, st.st_mtime_ns, params))
+        return os.path.join(self.cache_dir, hashlib.sha1(token.encode()).hexdigest() + ".bin")
+
+    def report(self):
+        """One line of phase timings in ms"""
+        parts = [f"{phase} {seconds * 1000:.1f} ms" for phase, seconds in self.timings.items()]
+        parts.append(f"{self.cache_hits}/{len(self._keys)} from cache")
+        return ", ".join(parts)
@@ -0,0 +1,125 @@
+"""Benchmark: collision detection cost as entity counts grow.
+
+    python space_shooter/bench_collisions.py --counts 100 500 2000 5000
+
+For each count N the playfield holds N player bullets, N enemy bullets
+and N/10 enemies at random positions that drift each frame. Three
+detectors find the bullet-vs-enemy and bullet-vs-enemy-bullet hits:
+
+* nested   - the original per-pair loops over lists of [x, y] lists
+* brute    - entities.hits(): every pair, but vectorized
+* hash     - broadphase.SpatialHash: exact tests on candidate pairs only
+
+All three must agree on the number of hits. The table shows the pair
+tests each one performs and its mean time per frame.
+"""
+import argparse
+import random
+import statistics
+import time
+
+from broadphase import SpatialHash
+from entities import Pool, hits, pair_off
+
+WIDTH, HEIGHT = 600, 800
+
+
+def nested(bullets, enemy_bullets, enemies):
+    """The loops from the original main(); returns (hits, pair tests)"""
+    bullets = [b[:] for b in bullets]
+    enemy_bullets = [eb[:] for eb in enemy_bullets]
+    enemies = [e[:] for e in enemies]
+    found = tests = 0
+    for eb in enemy_bullets[:]:
+        for b in bullets[:]:
+            tests += 1
+            if (b[0] > eb[0] and b[0] < eb[0]+10) and (b[1] > eb[1] and b[1] < eb[1]+20):
+                bullets.remove(b)
+                enemy_bullets.remove(eb)
+                found += 1
+                break
+    for e in enemies[:]:
+        for b in bullets[:]:
+            tests += 1
+            if (b[0] > e[0] and b[0] < e[0]+50) and (b[1] > e[1] and b[1] < e[1]+50):
+                enemies.remove(e)
+                bullets.remove(b)
+                found += 1
+                break
+    return found, tests
+
+
+def vectorized(bullets, enemy_bullets, enemies, detect):
+    """Same rules on pools with ``detect`` as the hit finder"""
+    cut, cut_by = pair_off(*detect(bullets, enemy_bullets))
+    # later tests must not see the bullets that were cut
+    alive = bullets.alive.copy()
+    bullets.alive[cut] = False
+    shots, _ = pair_off(*detect(bullets, enemies))
+    bullets.alive[:] = alive
+    return len(cut) + len(shots)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 500, 2000, 5000])
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--cell", type=int, default=64)
+    parser.add_argument("--skip-nested", type=int, default=3000,
+                        help="skip the nested loops above this count")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    grid = SpatialHash(WIDTH, HEIGHT, args.cell, brute_below=0)
+    print(f"{'N':>6} {'method':<7} {'pair tests':>12} {'ms/frame':>10}")
+    for n in args.counts:
+        rng = random.Random(args.seed)
+        bullets, enemy_bullets = Pool(n, 10, 20), Pool(n, 10, 20)
+        enemies = Pool(max(1, n // 10), 50, 50)
+        for pool, count in ((bullets, n), (enemy_bullets, n), (enemies, n // 10)):
+            for _ in range(count):
+                pool.spawn(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT))
+
+        results = {"nested": [], "brute": [], "hash": []}
+        tests = {}
+        for _ in range(args.frames):
+            for pool, dy in ((bullets, -10), (enemy_bullets, 7), (enemies, 3)):
+                pool.move(dy)
+                pool.y %= HEIGHT  # wrap around so the density stays put
+            counts = {}
+            if n <= args.skip_nested:
+                as_lists = [[[x, y] for x, y in zip(p.x[p.indices()].tolist(),
+                                                    p.y[p.indices()].tolist())]
+                            for p in (bullets, enemy_bullets, enemies)]
+                t0 = time.perf_counter()
+                counts["nested"], tests["nested"] = nested(*as_lists)
+                results["nested"].append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            counts["brute"] = vectorized(bullets, enemy_bullets, enemies, hits)
+            results["brute"].append(time.perf_counter() - t0)
+            tests["brute"] = len(bullets) * (len(enemy_bullets) + len(enemies))
+
+            candidates = []
+
+            def hashed(points, boxes):
+                found = grid.hits(points, boxes)
+                candidates.append(grid.candidates)
+                return found
+
+            t0 = time.perf_counter()
+            counts["hash"] = vectorized(bullets, enemy_bullets, enemies, hashed)
+            results["hash"].append(time.perf_counter() - t0)
+            tests["hash"] = sum(candidates)
+
+            if len(set(counts.values())) != 1:
+                raise SystemExit(f"hit counts differ at N={n}: {counts}")
+
+        for name, times in results.items():
+            if times:
+                print(f"{n:>6} {name:<7} {tests[name]:>12} "
+                      f"{statistics.mean(times) * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
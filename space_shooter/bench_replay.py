@@ -0,0 +1,143 @@
+"""Benchmark: update and render time per tick, replayed from recorded games.
+
+    python space_shooter/bench_replay.py --history bench_history.jsonl
+
+Each scenario is an autopilot game with tunables turned up (and lives
+effectively infinite), recorded once with replay.py into ``--dir``. Later
+runs replay the same file, so every code version is timed on identical
+input. The state hashes are checked along the way, so a change that
+alters the simulation is reported instead of silently timing another
+game. Use --rerecord after such a change.
+
+Rendering goes through the real render layer on the dummy SDL video
+driver (unless a display driver is already chosen). Update time per tick
+includes the state-hash check every 60 ticks. With --history each run is
+appended as JSON lines, compared with the previous run, and the script
+exits non-zero when a mean slows down by more than --fail-over.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from assets import default_cache_dir
+from replay import Replay, record
+from world import World
+
+# name -> (seed, ticks, overrides applied after every reset)
+SCENARIOS = {
+    "baseline": (1, 3600, {}),
+    "swarm": (2, 3600, {"difficulty": [(0, 3, 4)]}),
+    "barrage": (3, 3600, {"difficulty": [(0, 2, 10)], "fire_chance": 0.25}),
+    "bullet_hell": (4, 3600, {"difficulty": [(0, 1, 2)], "fire_chance": 0.1}),
+}
+
+
+def setup_for(overrides):
+    def setup(world):
+        world.lives = 10**9  # play the whole recording
+        for name, value in overrides.items():
+            setattr(world, name, value)
+    return setup
+
+
+def load_or_record(directory, name, rerecord=False):
+    seed, ticks, overrides = SCENARIOS[name]
+    path = os.path.join(directory, name + ".ssrp")
+    if rerecord or not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        world = World(seed)
+        setup_for(overrides)(world)
+        record(world, ticks).save(path)
+    return Replay.load(path)
+
+
+def p95(values):
+    return sorted(values)[int(0.95 * (len(values) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=SCENARIOS)
+    parser.add_argument("--dir", default=os.path.join(default_cache_dir(), "replays"))
+    parser.add_argument("--rerecord", action="store_true")
+    parser.add_argument("--no-render", action="store_true", help="time the simulation only")
+    parser.add_argument("--history", help="JSON-lines file of past results")
+    parser.add_argument("--fail-over", type=float, default=0.2,
+                        help="allowed slowdown of a mean vs. the previous run")
+    args = parser.parse_args()
+
+    renderer = None
+    if not args.no_render:
+        import pygame
+        import app  # opens the (dummy) window and builds the real render layer
+        app.load_assets()
+        renderer = app.renderer
+
+    results = {}
+    for name in args.scenarios:
+        replay = load_or_record(args.dir, name, args.rerecord)
+        update, render, entities = [], [], []
+        last = [0.0]
+
+        def on_tick(world):
+            t1 = time.perf_counter()
+            update.append(t1 - last[0])
+            entities.append(len(world.bullets) + len(world.enemy_bullets)
+                            + len(world.enemies) + len(world.powerups))
+            if renderer is not None:
+                pygame.display.update(renderer.draw(world, 1.0))
+            last[0] = time.perf_counter()
+            render.append(last[0] - t1)
+
+        if renderer is not None:
+            renderer.invalidate()
+        last[0] = time.perf_counter()
+        try:
+            replay.play(setup=setup_for(SCENARIOS[name][2]), on_tick=on_tick)
+        except RuntimeError as e:
+            raise SystemExit(f"{name}: {e}; the simulation changed, run with --rerecord")
+        results[name] = {
+            "ticks": len(update),
+            "entities": statistics.mean(entities),
+            "update_ms": statistics.mean(update) * 1000,
+            "update_p95_ms": p95(update) * 1000,
+        }
+        if renderer is not None:
+            results[name]["render_ms"] = statistics.mean(render) * 1000
+            results[name]["render_p95_ms"] = p95(render) * 1000
+
+    previous = {}
+    if args.history and os.path.exists(args.history):
+        with open(args.history, encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                previous[entry["scenario"]] = entry
+
+    print(f"{'scenario':<12} {'ticks':>6} {'entities':>9} {'update ms':>10} {'p95':>7} "
+          f"{'render ms':>10} {'p95':>7}")
+    regressions = []
+    for name, r in results.items():
+        print(f"{name:<12} {r['ticks']:>6} {r['entities']:>9.0f} {r['update_ms']:>10.3f} "
+              f"{r['update_p95_ms']:>7.3f} {r.get('render_ms', 0):>10.3f} "
+              f"{r.get('render_p95_ms', 0):>7.3f}")
+        before = previous.get(name, {})
+        for key in ("update_ms", "render_ms"):
+            if key in r and key in before:
+                if r[key] > before[key] * (1 + args.fail_over):
+                    regressions.append(f"{name} {key}: {before[key]:.3f} -> {r[key]:.3f}")
+
+    if args.history:
+        with open(args.history, "a", encoding="utf-8") as f:
+            for name, r in results.items():
+                f.write(json.dumps({"time": time.time(), "scenario": name, **r}) + "\n")
+    if regressions:
+        raise SystemExit("slower than the previous run:\n  " + "\n  ".join(regressions))
+
+
+if __name__ == "__main__":
+    main()
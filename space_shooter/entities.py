@@ -0,0 +1,124 @@
+"""Entity storage for the shooter: NumPy structure-of-arrays pools.
+
+Each kind of entity (bullets, enemy bullets, enemies, power-ups) lives in
+a ``Pool``: preallocated ``x``/``y`` arrays plus an ``alive`` mask. Dead
+slots go on a free list and are reused, so spawning and killing never
+reallocate, and per-frame work (movement, culling, collisions) is a few
+array operations over the whole pool instead of a Python loop per
+entity.
+
+Hit tests keep the game's original rule: an entity's (x, y) is a point,
+and it hits a box when it lies strictly inside it.
+"""
+import numpy as np
+
+
+class Pool:
+    def __init__(self, capacity, width, height):
+        self.width, self.height = width, height  # sprite size, used as the hitbox
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.prev_y = np.zeros(capacity, dtype=np.float32)  # y before the last move()
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.count = 0
+        self._free = list(range(capacity - 1, -1, -1))
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def capacity(self):
+        return len(self.alive)
+
+    def _grow(self):
+        old = self.capacity
+        self.x = np.concatenate([self.x, np.zeros(old, dtype=np.float32)])
+        self.y = np.concatenate([self.y, np.zeros(old, dtype=np.float32)])
+        self.prev_y = np.concatenate([self.prev_y, np.zeros(old, dtype=np.float32)])
+        self.alive = np.concatenate([self.alive, np.zeros(old, dtype=bool)])
+        self._free.extend(range(2 * old - 1, old - 1, -1))
+
+    def spawn(self, x, y):
+        """Place one entity in a free slot (the pool doubles when full)"""
+        if not self._free:
+            self._grow()
+        i = self._free.pop()
+        self.x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.alive[i] = True
+        self.count += 1
+        return i
+
+    def kill(self, indices):
+        """Free the slots in ``indices`` (an int or an array of live slots)"""
+        indices = np.atleast_1d(indices)
+        if len(indices):
+            self.alive[indices] = False
+            self.count -= len(indices)
+            self._free.extend(indices.tolist())
+
+    def clear(self):
+        self.alive[:] = False
+        self.count = 0
+        self._free = list(range(self.capacity - 1, -1, -1))
+
+    def indices(self):
+        """Live slots in slot order"""
+        return np.flatnonzero(self.alive)
+
+    def move(self, dy):
+        # dead slots move too: touching the whole array beats masking it
+        self.prev_y[:] = self.y
+        self.y += dy
+
+    def lerp_y(self, slots, alpha):
+        """y of ``slots`` blended from before to after the last move()"""
+        prev = self.prev_y[slots]
+        return prev + (self.y[slots] - prev) * alpha
+
+    def cull(self, top, bottom):
+        """Kill entities with y < top or y > bottom; return their slots"""
+        gone = np.flatnonzero(self.alive & ((self.y < top) | (self.y > bottom)))
+        self.kill(gone)
+        return gone
+
+    def inside(self, x, y, width, height):
+        """Live slots whose point lies strictly inside one box"""
+        return np.flatnonzero(self.alive & (self.x > x) & (self.x < x + width)
+                              & (self.y > y) & (self.y < y + height))
+
+
+def hits(points, boxes):
+    """(point_slots, box_slots) of every point strictly inside a box.
+
+    Brute force over all live pairs with broadcasting, sorted by box
+    slot then point slot.
+    """
+    p = points.indices()
+    b = boxes.indices()
+    if not len(p) or not len(b):
+        return p[:0], b[:0]
+    px, py = points.x[p], points.y[p]
+    bx, by = boxes.x[b, None], boxes.y[b, None]
+    mask = ((px > bx) & (px < bx + boxes.width) & (py > by) & (py < by + boxes.height))
+    bi, pi = np.nonzero(mask)
+    return p[pi], b[bi]
+
+
+def pair_off(point_slots, box_slots):
+    """Greedy one-to-one matching of hit pairs, in the order given.
+
+    Each point and each box is used at most once: a bullet destroys one
+    enemy, and an enemy is destroyed by one bullet.
+    """
+    if len(np.unique(point_slots)) == len(point_slots) and \
+            len(np.unique(box_slots)) == len(box_slots):
+        return point_slots, box_slots  # the usual case: no contested hits
+    used_p, used_b = set(), set()
+    keep = []
+    for k, (p, b) in enumerate(zip(point_slots.tolist(), box_slots.tolist())):
+        if p not in used_p and b not in used_b:
+            used_p.add(p)
+            used_b.add(b)
+            keep.append(k)
+    return point_slots[keep], box_slots[keep]
@@ -0,0 +1,148 @@
+"""Render layer for the shooter: cached text, one sprite atlas, batched blits.
+
+* ``TextCache`` renders a string once and hands back the same surface
+  until the text changes, so the HUD costs one blit per line.
+* ``Atlas`` packs every sprite into a single ``convert_alpha()``'d
+  surface, converted once to the display format instead of on every
+  blit.
+* ``Renderer`` draws each entity pool with one ``Surface.blits()`` call.
+  It erases only the rectangles drawn last frame and returns the dirty
+  rectangles for ``pygame.display.update()``. When too much of the screen
+  changed it falls back to a full flip.
+* ``FrameStats`` keeps rolling per-phase timings so the cost of each
+  part of a frame can be shown on screen or printed on exit.
+"""
+import time
+from collections import OrderedDict, deque
+
+import pygame
+
+
+class TextCache:
+    def __init__(self, font, color, size=64):
+        self.font = font
+        self.color = color
+        self.size = size
+        self._surfaces = OrderedDict()
+        self.renders = 0  # font.render() calls so far
+
+    def get(self, text):
+        surface = self._surfaces.get(text)
+        if surface is None:
+            surface = self.font.render(text, True, self.color).convert_alpha()
+            self.renders += 1
+            self._surfaces[text] = surface
+            if len(self._surfaces) > self.size:
+                self._surfaces.popitem(last=False)
+        else:
+            self._surfaces.move_to_end(text)
+        return surface
+
+
+class Atlas:
+    """Sprites packed in rows into one surface; ``rects[name]`` is the source area"""
+
+    def __init__(self, sprites, width=256, padding=1):
+        placed = {}
+        x = y = shelf = 0
+        for name, surface in sorted(sprites.items(), key=lambda item: -item[1].get_height()):
+            w, h = surface.get_size()
+            if x + w > width:
+                x, y, shelf = 0, y + shelf + padding, 0
+            placed[name] = pygame.Rect(x, y, w, h)
+            x += w + padding
+            shelf = max(shelf, h)
+
+        self.surface = pygame.Surface((width, y + shelf), pygame.SRCALPHA).convert_alpha()
+        self.surface.fill((0, 0, 0, 0))
+        for name, rect in placed.items():
+            self.surface.blit(sprites[name], rect)
+        self.rects = placed
+
+
+class FrameStats:
+    """Rolling mean, in ms, of named per-frame timings and counters"""
+
+    def __init__(self, window=120):
+        self.window = window
+        self.series = {}
+        self._frame = {}
+
+    def add(self, name, value):
+        self._frame[name] = self._frame.get(name, 0) + value
+
+    def end_frame(self):
+        for name, value in self._frame.items():
+            self.series.setdefault(name, deque(maxlen=self.window)).append(value)
+        self._frame = {}
+
+    def means(self):
+        return {name: sum(values) / len(values) for name, values in self.series.items()}
+
+    def lines(self):
+        return [f"{name}: {value:.2f}" for name, value in self.means().items()]
+
+    def summary(self):
+        return "  ".join(self.lines())
+
+
+class Renderer:
+    def __init__(self, screen, atlas, hud, background=(0, 0, 0), full_redraw=0.5):
+        self.screen = screen
+        self.atlas = atlas
+        self.hud = hud
+        self.background = pygame.Surface(screen.get_size()).convert()
+        self.background.fill(background)
+        # full flip once the dirty area passes this share of the screen
+        self.full_limit = full_redraw * screen.get_width() * screen.get_height()
+        self.stats = FrameStats()
+        self._drawn = []
+        self._full = True
+
+    def invalidate(self):
+        """Force a full redraw next frame (after something else drew on the screen)"""
+        self._full = True
+
+    def draw(self, world, alpha, extra_text=()):
+        """Draw one frame; returns the rectangles to pass to display.update()"""
+        t0 = time.perf_counter()
+        screen, atlas, rects = self.screen, self.atlas.surface, self.atlas.rects
+        if self._full:
+            screen.blit(self.background, (0, 0))
+        else:
+            screen.blits([(self.background, r, r) for r in self._drawn], False)
+        t1 = time.perf_counter()
+
+        player_x = world.prev_player_x + (world.player_x - world.prev_player_x) * alpha
+        drawn = [screen.blit(atlas, (player_x, world.player_y), rects["player"])]
+        blits = 1
+        for name, pool in (("bullet", world.bullets), ("enemy", world.enemies),
+                           ("enemy_bullet", world.enemy_bullets), ("powerup", world.powerups)):
+            idx = pool.indices()
+            if len(idx):
+                area = rects[name]
+                xs, ys = pool.x[idx].tolist(), pool.lerp_y(idx, alpha).tolist()
+                drawn += screen.blits([(atlas, (x, y), area) for x, y in zip(xs, ys)])
+                blits += len(idx)
+        t2 = time.perf_counter()
+
+        lines = [f"Score: {world.score}", f"Lives: {world.lives}",
+                 f"Power Level: {world.bullets_per_shot}", *extra_text]
+        drawn += screen.blits([(self.hud.get(text), (10, 10 + 30 * i))
+                               for i, text in enumerate(lines)])
+        t3 = time.perf_counter()
+
+        dirty = self._drawn + drawn
+        area = sum(r.w * r.h for r in dirty)
+        if self._full or area > self.full_limit:
+            dirty = [screen.get_rect()]
+        self._full = False
+        self._drawn = drawn
+
+        stats = self.stats
+        stats.add("clear ms", (t1 - t0) * 1000)
+        stats.add("sprites ms", (t2 - t1) * 1000)
+        stats.add("hud ms", (t3 - t2) * 1000)
+        stats.add("blits", blits)
+        stats.add("dirty rects", len(dirty))
+        return dirty
@@ -0,0 +1,154 @@
+"""Input recording and deterministic replay for the shooter.
+
+A game is fully determined by its seed and the input bits of every tick
+(see world.py), so a recording holds only those two things plus a state
+hash every ``hash_every`` ticks to catch divergence. The log is binary:
+
+    header   "SSRP", version u16, seed u32, ticks u32, hash_every u16, runs u32
+    inputs   one (input bits u8, length u16) pair per run of equal inputs
+    hashes   u64 state hash after every hash_every-th tick and the last tick
+
+A minute of play is typically well under ten kilobytes.
+
+    python space_shooter/replay.py record game.ssrp --seed 3 --ticks 20000
+    python space_shooter/replay.py verify game.ssrp
+"""
+import argparse
+import struct
+import time
+from array import array
+
+from world import World, autopilot
+
+MAGIC = b"SSRP"
+VERSION = 1
+_HEADER = struct.Struct("<4sHIIHI")
+_RUN = struct.Struct("<BH")
+SEEDS = 2 ** 32  # the header stores the seed as u32
+
+
+def seed_arg(text):
+    """argparse type for a seed the replay header can store"""
+    seed = int(text)
+    if not 0 <= seed < SEEDS:
+        raise argparse.ArgumentTypeError(f"seed must be between 0 and {SEEDS - 1}")
+    return seed
+
+
+class Recorder:
+    """Collects the inputs of one game; call ``tick()`` right after each step"""
+
+    def __init__(self, world, hash_every=60):
+        if not 0 <= world.seed < SEEDS:
+            raise ValueError(f"seed {world.seed} does not fit a replay header")
+        self.world = world
+        self.seed = world.seed
+        self.hash_every = hash_every
+        self.inputs = bytearray()
+        self.hashes = array("Q")
+
+    def tick(self, inputs):
+        self.inputs.append(inputs)
+        if len(self.inputs) % self.hash_every == 0:
+            self.hashes.append(self.world.state_hash())
+
+    def save(self, path):
+        runs = []
+        for bits in self.inputs:
+            if runs and runs[-1][0] == bits and runs[-1][1] < 0xFFFF:
+                runs[-1][1] += 1
+            else:
+                runs.append([bits, 1])
+        hashes = array("Q", self.hashes)
+        hashes.append(self.world.state_hash())  # final state, whatever the tick count
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, self.seed, len(self.inputs),
+                                 self.hash_every, len(runs)))
+            f.write(b"".join(_RUN.pack(bits, length) for bits, length in runs))
+            f.write(hashes.tobytes())
+
+
+class Replay:
+    def __init__(self, seed, inputs, hash_every, hashes):
+        self.seed = seed
+        self.inputs = inputs
+        self.hash_every = hash_every
+        self.hashes = hashes
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, ticks, hash_every, runs = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay")
+        inputs = bytearray()
+        offset = _HEADER.size
+        for bits, length in _RUN.iter_unpack(data[offset:offset + runs * _RUN.size]):
+            inputs.extend(bytes([bits]) * length)
+        if len(inputs) != ticks:
+            raise ValueError(f"{path}: {len(inputs)} inputs for {ticks} ticks")
+        hashes = array("Q")
+        hashes.frombytes(data[offset + runs * _RUN.size:])
+        return cls(seed, bytes(inputs), hash_every, hashes)
+
+    def play(self, world=None, setup=None, on_tick=None):
+        """Re-run the game headlessly and check every recorded state hash.
+
+        ``setup(world)`` runs after the reset (to apply the overrides the
+        game was recorded with) and ``on_tick(world)`` after every step.
+        Raises RuntimeError at the first tick whose state differs.
+        """
+        world = world or World(self.seed)
+        world.reset(self.seed)
+        if setup is not None:
+            setup(world)
+        expected = iter(self.hashes)
+        for tick, bits in enumerate(self.inputs, 1):
+            world.step(bits)
+            if on_tick is not None:
+                on_tick(world)
+            if tick % self.hash_every == 0 and world.state_hash() != next(expected):
+                raise RuntimeError(f"state diverged by tick {tick}")
+        if world.state_hash() != next(expected):
+            raise RuntimeError(f"final state differs after {len(self.inputs)} ticks")
+        return world
+
+
+def record(world, ticks, policy=autopilot, hash_every=60):
+    """Play ``ticks`` ticks (or until game over) with ``policy`` and record them"""
+    recorder = Recorder(world, hash_every)
+    for _ in range(ticks):
+        if world.over:
+            break
+        bits = policy(world)
+        world.step(bits)
+        recorder.tick(bits)
+    return recorder
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record and verify game replays")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="record an autopilot game")
+    rec.add_argument("path")
+    rec.add_argument("--seed", type=seed_arg, default=0)
+    rec.add_argument("--ticks", type=int, default=20000)
+    ver = sub.add_parser("verify", help="replay headlessly and check state hashes")
+    ver.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        recorder = record(World(args.seed), args.ticks)
+        recorder.save(args.path)
+        print(f"{len(recorder.inputs)} ticks, score {recorder.world.score} -> {args.path}")
+    else:
+        t0 = time.perf_counter()
+        try:
+            replay = Replay.load(args.path)
+            world = replay.play()
+        except (RuntimeError, ValueError) as e:
+            raise SystemExit(f"{args.path}: {e}")
+        seconds = time.perf_counter() - t0
+        print(f"{args.path}: {len(replay.inputs)} ticks verified in {seconds:.2f} s, "
+              f"score {world.score}")
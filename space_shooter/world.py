@@ -0,0 +1,234 @@
+"""Deterministic game simulation for the shooter, free of pygame.
+
+``World.step(inputs)`` advances the game by one fixed tick of 1/60 s.
+Speeds and timers count ticks rather than rendered frames, so a slow
+frame no longer slows the game down: the window runs as many ticks as
+real time requires and draws in between (see app.py). All randomness
+comes from one seeded ``numpy.random.Generator``, so a seed plus the
+per-tick input bits reproduce a game exactly.
+
+Run without a window, as fast as the CPU allows:
+
+    python space_shooter/world.py --ticks 200000 --seed 1
+"""
+import argparse
+import hashlib
+import time
+
+import numpy as np
+
+from broadphase import SpatialHash
+from entities import Pool, pair_off
+
+WIDTH, HEIGHT = 600, 800
+TICK_RATE = 60
+TICK = 1 / TICK_RATE
+
+# Input bits passed to step()
+LEFT, RIGHT, FIRE = 1, 2, 4
+
+# Player
+PLAYER_WIDTH, PLAYER_HEIGHT = 50, 50
+PLAYER_SPEED = 7
+PLAYER_LIVES = 5
+
+# Bullets
+BULLET_SPEED = 10
+ENEMY_BULLET_SPEED = 7
+BULLET_COOLDOWN_MAX = 12
+ENEMY_FIRE_CHANCE = 0.02
+
+# Enemies
+ENEMY_WIDTH, ENEMY_HEIGHT = 50, 50
+
+# Power-ups
+POWERUP_SPEED = 3
+POWERUP_CHANCE = 0.2
+BOOST_TICKS = 300
+
+# (score, enemy speed, ticks between spawns), checked in order
+DIFFICULTY = [(0, 3, 30), (10, 4, 30), (20, 5, 25), (30, 6, 20)]
+
+
+class World:
+    def __init__(self, seed=None):
+        self.bullets = Pool(256, 10, 20)
+        self.enemy_bullets = Pool(256, 10, 20)
+        self.enemies = Pool(64, ENEMY_WIDTH, ENEMY_HEIGHT)
+        self.powerups = Pool(16, 30, 30)
+        self.grid = SpatialHash(WIDTH, HEIGHT)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Start a new game, reusing the entity pools"""
+        if seed is None:
+            seed = int(np.random.default_rng().integers(2**32))
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        # tunables, overridable per game (benchmarks build heavy scenarios)
+        self.fire_chance = ENEMY_FIRE_CHANCE
+        self.difficulty = DIFFICULTY
+        for pool in (self.bullets, self.enemy_bullets, self.enemies, self.powerups):
+            pool.clear()
+
+        self.player_x = self.prev_player_x = WIDTH//2 - PLAYER_WIDTH//2
+        self.player_y = HEIGHT - PLAYER_HEIGHT - 10
+        self.lives = PLAYER_LIVES
+        self.bullet_cooldown = 0
+        self.bullets_per_shot = 1
+        self.boost_timer = 0
+        self.enemy_speed, self.enemy_spawn_rate = self.difficulty[0][1:]
+        self.spawn_timer = 0
+        self.score = 0
+        self.ticks = 0
+        self.over = False
+        self.events = []  # sounds triggered by the last step(): "shot", "hit", "powerup"
+
+    def step(self, inputs):
+        """Advance one tick with ``inputs`` a mask of LEFT/RIGHT/FIRE"""
+        self.events = []
+        self.prev_player_x = self.player_x
+        self.ticks += 1
+        rng = self.rng
+        bullets, enemy_bullets = self.bullets, self.enemy_bullets
+        enemies, powerups = self.enemies, self.powerups
+        px, py = self.player_x, self.player_y
+
+        # Player continuous firing
+        if inputs & FIRE and self.bullet_cooldown == 0:
+            n = self.bullets_per_shot
+            for i in range(n):
+                offset = i * 10 - (n-1)*5
+                bullets.spawn(px + PLAYER_WIDTH//2 - 5 + offset, py)
+            self.bullet_cooldown = BULLET_COOLDOWN_MAX
+            self.events.append("shot")
+        if self.bullet_cooldown > 0:
+            self.bullet_cooldown -= 1
+
+        # Move bullets
+        bullets.move(-BULLET_SPEED)
+        bullets.cull(0, np.inf)
+
+        # Spawn enemies
+        self.spawn_timer += 1
+        if self.spawn_timer > self.enemy_spawn_rate:
+            enemies.spawn(int(rng.integers(0, WIDTH - ENEMY_WIDTH + 1)), -ENEMY_HEIGHT)
+            self.spawn_timer = 0
+
+        # Move enemies and fire bullets
+        enemies.move(self.enemy_speed)
+        live = enemies.indices()
+        for e in live[rng.random(len(live)) < self.fire_chance].tolist():
+            enemy_bullets.spawn(enemies.x[e] + ENEMY_WIDTH//2 - 5, enemies.y[e] + ENEMY_HEIGHT)
+        self.lives -= len(enemies.cull(-np.inf, HEIGHT))
+
+        # Move enemy bullets; collide with the player and with player bullets
+        enemy_bullets.move(ENEMY_BULLET_SPEED)
+        enemy_bullets.cull(-np.inf, HEIGHT)
+        hit = enemy_bullets.inside(px, py, PLAYER_WIDTH, PLAYER_HEIGHT)
+        enemy_bullets.kill(hit)
+        self.lives -= len(hit)
+        cut, cut_by = pair_off(*self.grid.hits(bullets, enemy_bullets))
+        bullets.kill(cut)
+        enemy_bullets.kill(cut_by)
+
+        # Move power-ups
+        powerups.move(POWERUP_SPEED)
+        powerups.cull(-np.inf, HEIGHT)
+
+        # Enemy hit
+        shots, destroyed = pair_off(*self.grid.hits(bullets, enemies))
+        bullets.kill(shots)
+        enemies.kill(destroyed)
+        if len(destroyed):
+            self.score += len(destroyed)
+            self.events.append("hit")
+        for e in destroyed.tolist():
+            if rng.random() < POWERUP_CHANCE and self.bullets_per_shot < 3:
+                powerups.spawn(enemies.x[e]+10, enemies.y[e]+10)
+
+        # Player collects power-ups
+        collected = powerups.inside(px, py, PLAYER_WIDTH, PLAYER_HEIGHT)
+        if len(collected):
+            self.bullets_per_shot = min(3, self.bullets_per_shot + len(collected))
+            self.boost_timer = BOOST_TICKS
+            powerups.kill(collected)
+            self.events.append("powerup")
+
+        if self.lives <= 0:
+            self.over = True
+
+        # Reduce boost timer
+        if self.bullets_per_shot > 1:
+            self.boost_timer -= 1
+            if self.boost_timer <= 0:
+                self.bullets_per_shot -= 1
+                self.boost_timer = 0
+
+        # Player movement
+        if inputs & LEFT and self.player_x > 0:
+            self.player_x -= PLAYER_SPEED
+        if inputs & RIGHT and self.player_x < WIDTH - PLAYER_WIDTH:
+            self.player_x += PLAYER_SPEED
+
+        # Difficulty increase
+        for score, speed, rate in self.difficulty:
+            if self.score >= score:
+                self.enemy_speed, self.enemy_spawn_rate = speed, rate
+
+    def state_hash(self):
+        """64-bit digest of everything that affects the next ticks"""
+        h = hashlib.blake2b(digest_size=8)
+        h.update(repr((self.ticks, self.player_x, self.lives, self.score, self.bullet_cooldown,
+                       self.bullets_per_shot, self.boost_timer, self.spawn_timer,
+                       self.enemy_speed, self.over)).encode())
+        h.update(repr(self.rng.bit_generator.state).encode())
+        for pool in (self.bullets, self.enemy_bullets, self.enemies, self.powerups):
+            live = pool.indices()
+            h.update(live.tobytes())
+            h.update(pool.x[live].tobytes())
+            h.update(pool.y[live].tobytes())
+        return int.from_bytes(h.digest(), "little")
+
+
+def autopilot(world):
+    """Input bits for a simple bot: keep firing, chase the lowest enemy"""
+    inputs = FIRE
+    live = world.enemies.indices()
+    if len(live):
+        target = world.enemies.x[live[np.argmax(world.enemies.y[live])]] + ENEMY_WIDTH / 2
+        centre = world.player_x + PLAYER_WIDTH / 2
+        if target < centre - PLAYER_SPEED:
+            inputs |= LEFT
+        elif target > centre + PLAYER_SPEED:
+            inputs |= RIGHT
+    return inputs
+
+
+def run_headless(world, ticks, policy=autopilot, restart=True):
+    """Step ``ticks`` times with inputs from ``policy(world)``; return finished games' scores"""
+    scores = []
+    for _ in range(ticks):
+        if world.over:
+            scores.append(world.score)
+            if not restart:
+                break
+            world.reset(world.seed + 1)
+        world.step(policy(world))
+    return scores
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the simulation without a window")
+    parser.add_argument("--ticks", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    world = World(args.seed)
+    t0 = time.perf_counter()
+    scores = run_headless(world, args.ticks)
+    seconds = time.perf_counter() - t0
+    print(f"{args.ticks} ticks in {seconds:.2f} s ({args.ticks / seconds:,.0f} ticks/s, "
+          f"{args.ticks / TICK_RATE / seconds:.0f}x real time)")
+    if scores:
+        print(f"{len(scores)} games finished, mean score {np.mean(scores):.1f}")
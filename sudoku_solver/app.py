@@ -1,15 +1,30 @@
+import argparse
 import pygame
 import sys
+import threading
 import time
 import copy
 
+from engine import SYMBOLS
+from generate import generate
+from worker import SolveWorker
+
+parser = argparse.ArgumentParser(description="Interactive Sudoku solver")
+parser.add_argument("--size", type=int, choices=(9, 16, 25), default=9)
+parser.add_argument("--seed", type=int, default=None,
+                    help="play a generated puzzle (always for 16 and 25)")
+args = parser.parse_args()
+
 pygame.init()
 
 # -----------------------------
 # Display settings
 # -----------------------------
 WIDTH, HEIGHT = 540, 600
-CELL = WIDTH // 9
+SIZE = args.size
+BOX = {9: 3, 16: 4, 25: 5}[SIZE]
+CELL = WIDTH // SIZE
+GRID = CELL * SIZE
 SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Interactive Sudoku Solver")
 
@@ -22,7 +37,7 @@ GREEN = (0, 128, 0)
 GRAY = (200, 200, 200)
 
 # Fonts
-FONT = pygame.font.SysFont("comicsans", 40)
+FONT = pygame.font.SysFont("comicsans", CELL * 2 // 3)
 SMALL_FONT = pygame.font.SysFont("comicsans", 25)
 
 # -----------------------------
@@ -40,46 +55,80 @@ puzzle = [
     [0, 0, 0, 0, 0, 0, 0, 0, 0]
 ]
 
+if SIZE != 9 or args.seed is not None:
+    # a 25x25 puzzle takes tens of seconds to generate; do it on a thread
+    # and keep the window responsive with a running timer meanwhile
+    generated = []
+    thread = threading.Thread(target=lambda: generated.append(generate(BOX, args.seed)),
+                              name="generator", daemon=True)
+    thread.start()
+    clock = pygame.time.Clock()
+    t0 = time.perf_counter()
+    while thread.is_alive():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+        SCREEN.fill(WHITE)
+        message = f"Generating a {SIZE}x{SIZE} puzzle... {time.perf_counter() - t0:.0f} s"
+        SCREEN.blit(SMALL_FONT.render(message, True, BLACK), (20, 20))
+        pygame.display.update()
+        clock.tick(10)
+    cells, _ = generated[0]
+    puzzle = [cells[r*SIZE:(r+1)*SIZE] for r in range(SIZE)]
+
 board = copy.deepcopy(puzzle)
 selected_cell = None
+GLYPHS = {}
 
 # -----------------------------
 # Utility functions
 # -----------------------------
 def draw_grid():
     SCREEN.fill(WHITE)
-    for i in range(10):
-        width = 4 if i % 3 == 0 else 1
-        pygame.draw.line(SCREEN, BLACK, (0, i*CELL), (WIDTH, i*CELL), width)
-        pygame.draw.line(SCREEN, BLACK, (i*CELL, 0), (i*CELL, WIDTH), width)
+    for i in range(SIZE + 1):
+        width = 4 if i % BOX == 0 else 1
+        pygame.draw.line(SCREEN, BLACK, (0, i*CELL), (GRID, i*CELL), width)
+        pygame.draw.line(SCREEN, BLACK, (i*CELL, 0), (i*CELL, GRID), width)
+
+def glyph(digit, color):
+    # each digit is rendered once per color, not on every redraw
+    key = (digit, color)
+    if key not in GLYPHS:
+        GLYPHS[key] = FONT.render(SYMBOLS[digit - 1], True, color)
+    return GLYPHS[key]
+
+def draw_cell(i, j):
+    """Redraw one cell inside its grid lines; returns the rect to update"""
+    rect = pygame.Rect(j*CELL + 3, i*CELL + 3, CELL - 5, CELL - 5)
+    SCREEN.fill(WHITE, rect)
+    if board[i][j] != 0:
+        color = BLUE if puzzle[i][j] == 0 else BLACK
+        SCREEN.set_clip(rect)
+        text = glyph(board[i][j], color)
+        SCREEN.blit(text, text.get_rect(center=rect.center))
+        SCREEN.set_clip(None)
+    return rect
 
 def draw_numbers():
-    for i in range(9):
-        for j in range(9):
-            if board[i][j] != 0:
-                color = BLUE if puzzle[i][j] == 0 else BLACK
-                text = FONT.render(str(board[i][j]), True, color)
-                SCREEN.blit(text, (j*CELL + 15, i*CELL + 10))
+    for i in range(SIZE):
+        for j in range(SIZE):
+            draw_cell(i, j)
 
 def select_cell(pos):
     global selected_cell
     x, y = pos
     row = y // CELL
     col = x // CELL
-    selected_cell = (row, col)
-
-def is_valid(board, row, col, num):
-    if num in board[row]: return False
-    if num in [board[i][col] for i in range(9)]: return False
-    start_row, start_col = 3*(row//3), 3*(col//3)
-    for i in range(3):
-        for j in range(3):
-            if board[start_row+i][start_col+j] == num:
-                return False
-    return True
+    if row < SIZE and col < SIZE:
+        selected_cell = (row, col)
+
+# plain backtracking never finishes beyond 9x9 (see engine.py), so its
+# button is greyed out and ignored on larger boards
+BACKTRACKING = SIZE == 9
 
 def draw_buttons():
-    pygame.draw.rect(SCREEN, GREEN, (50, WIDTH + 10, 150, 40))
+    pygame.draw.rect(SCREEN, GREEN if BACKTRACKING else GRAY, (50, WIDTH + 10, 150, 40))
     pygame.draw.rect(SCREEN, RED, (WIDTH - 200, WIDTH + 10, 150, 40))
     SCREEN.blit(SMALL_FONT.render("Backtracking", True, WHITE), (60, WIDTH+15))
     SCREEN.blit(SMALL_FONT.render("Branch & Bound", True, WHITE), (WIDTH-190, WIDTH+15))
@@ -87,107 +136,94 @@ def draw_buttons():
 # -----------------------------
 # Solvers with visualization
 # -----------------------------
-def find_empty(board):
-    for i in range(9):
-        for j in range(9):
-            if board[i][j] == 0:
-                return i, j
-    return None
-
-def solve_backtracking_vis(board):
-    empty = find_empty(board)
-    if not empty:
-        return True
-    row, col = empty
-    for num in range(1,10):
-        if is_valid(board,row,col,num):
-            board[row][col] = num
-            draw_grid()
-            draw_numbers()
-            pygame.display.update()
-            pygame.time.delay(30)
-            if solve_backtracking_vis(board):
-                return True
-            board[row][col] = 0
-            draw_grid()
-            draw_numbers()
-            pygame.display.update()
-            pygame.time.delay(30)
-    return False
-
-def solve_branch_bound_vis(board):
-    empty_cells = [(i,j) for i in range(9) for j in range(9) if board[i][j]==0]
-    if not empty_cells:
-        return True
-
-    # select cell with fewest candidates
-    min_candidates = 10
-    for i,j in empty_cells:
-        candidates = [num for num in range(1,10) if is_valid(board,i,j,num)]
-        if len(candidates) < min_candidates:
-            min_candidates = len(candidates)
-            best_cell = (i,j)
-            best_candidates = candidates
-
-    if min_candidates == 0:
-        return False
-
-    row,col = best_cell
-    for num in best_candidates:
-        board[row][col] = num
-        draw_grid()
-        draw_numbers()
-        pygame.display.update()
-        pygame.time.delay(5)
-        if solve_branch_bound_vis(board):
-            return True
-        board[row][col] = 0
-        draw_grid()
-        draw_numbers()
-        pygame.display.update()
-        pygame.time.delay(5)
-    return False
+# The search runs on a worker thread (worker.py) and the loop below
+# replays its steps at the old per-step delays of 30 ms and 5 ms, never
+# spending more than FRAME_BUDGET on them per frame.
+SOLVERS = {"backtracking": "Backtracking", "propagate": "Branch & Bound"}
+STEPS_PER_SECOND = {"backtracking": 1000 / 30, "propagate": 1000 / 5}
+FRAME_BUDGET = 0.008
+worker = None
+allowance = 0.0
+
+def start_solve(method):
+    global board, worker, allowance
+    if worker is not None:
+        worker.cancel()
+    board = copy.deepcopy(puzzle)
+    worker = SolveWorker([d for row in puzzle for d in row], method)
+    allowance = 0.0
+    draw_numbers()
+    pygame.display.update()
+
+def play_steps(dt):
+    """Apply queued solver steps; returns the rects of the changed cells"""
+    global worker, allowance
+    rate = STEPS_PER_SECOND[worker.method]
+    allowance = min(allowance + rate * dt, rate)
+    changed = set()
+    deadline = time.perf_counter() + FRAME_BUDGET
+    while allowance >= 1 and time.perf_counter() < deadline:
+        steps = worker.poll(min(int(allowance), 256))
+        if not steps:
+            break
+        allowance -= len(steps)
+        for step in steps:
+            if step is None:
+                finish_solve()
+                return [draw_cell(i, j) for i, j in changed]
+            cell, digit = step
+            board[cell // SIZE][cell % SIZE] = digit
+            changed.add((cell // SIZE, cell % SIZE))
+    return [draw_cell(i, j) for i, j in changed]
+
+def finish_solve():
+    global worker
+    name = SOLVERS[worker.method]
+    if worker.error is not None:
+        print(f"{name}: {worker.error}")
+    elif not worker.solved:
+        print(f"{name}: no solution ({worker.seconds * 1000:.2f} ms)")
+    else:
+        print(f"{name} solved in: {worker.seconds * 1000:.2f} ms")
+    worker = None
 
 # -----------------------------
 # Main loop
 # -----------------------------
+clock = pygame.time.Clock()
+draw_grid()
+draw_numbers()
+draw_buttons()
+pygame.display.update()
+
 running = True
 while running:
-    draw_grid()
-    draw_numbers()
-    draw_buttons()
-    pygame.display.update()
+    dt = clock.tick(60) / 1000
+    dirty = []
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
+            if worker is not None:
+                worker.cancel()
             pygame.quit()
             sys.exit()
         if event.type == pygame.MOUSEBUTTONDOWN:
             x, y = pygame.mouse.get_pos()
             if y < WIDTH:
                 select_cell((x,y))
-            elif 50 <= x <= 200 and WIDTH+10 <= y <= WIDTH+50:
-                # Backtracking solve
-                board = copy.deepcopy(puzzle)
-                start = time.time()
-                solve_backtracking_vis(board)
-                print("Backtracking solved in:", round(time.time()-start,2),"s")
+            elif BACKTRACKING and 50 <= x <= 200 and WIDTH+10 <= y <= WIDTH+50:
+                start_solve("backtracking")
             elif WIDTH-200 <= x <= WIDTH-50 and WIDTH+10 <= y <= WIDTH+50:
-                # Branch & Bound solve
-                board = copy.deepcopy(puzzle)
-                start = time.time()
-                solve_branch_bound_vis(board)
-                print("Branch & Bound solved in:", round(time.time()-start,2),"s")
-        if event.type == pygame.KEYDOWN and selected_cell:
+                start_solve("propagate")
+        if event.type == pygame.KEYDOWN and selected_cell and worker is None:
             row, col = selected_cell
-            if event.key == pygame.K_1: board[row][col]=1
-            if event.key == pygame.K_2: board[row][col]=2
-            if event.key == pygame.K_3: board[row][col]=3
-            if event.key == pygame.K_4: board[row][col]=4
-            if event.key == pygame.K_5: board[row][col]=5
-            if event.key == pygame.K_6: board[row][col]=6
-            if event.key == pygame.K_7: board[row][col]=7
-            if event.key == pygame.K_8: board[row][col]=8
-            if event.key == pygame.K_9: board[row][col]=9
+            key = event.unicode.upper()
+            if key and key in SYMBOLS[:SIZE]: board[row][col]=SYMBOLS.index(key) + 1
             if event.key == pygame.K_DELETE or event.key == pygame.K_BACKSPACE:
                 board[row][col]=0
+            dirty.append(draw_cell(row, col))
+
+    if worker is not None:
+        dirty += play_steps(dt)
+    if dirty:
+        pygame.display.update(dirty)
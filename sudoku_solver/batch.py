@@ -0,0 +1,117 @@
+"""Headless bulk solving: puzzle files in, solutions with timings out.
+
+    python sudoku_solver/batch.py puzzles.txt > solutions.txt
+    cat a.txt b.txt | python sudoku_solver/batch.py - --method dlx --workers 8
+
+Input is the common one-puzzle-per-line format: 81 characters with '0'
+or '.' for empty cells (256 or 625 with A-P for 16x16 and 25x25). Anything
+after the first comma or whitespace is ignored, and blank lines and '#'
+comments are skipped. Output has one line per puzzle, in input order:
+
+    <solution>\t<solve ms>
+    unsolvable\t<solve ms>
+    error: <message>
+
+Lines are read lazily and sent to a process pool in chunks. At most a
+few chunks per worker are in flight, so files of any size stream
+through in constant memory, and each chunk's results are written as
+soon as every chunk before it is done. Timings cover the solve only,
+not parsing or I/O. A throughput summary goes to stderr.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import dlx
+import engine
+
+SOLVERS = {
+    "propagate": lambda cells: engine.solve(cells, "propagate"),
+    "backtracking": lambda cells: engine.solve(cells, "backtracking"),
+    "dlx": dlx.solve,
+}
+
+
+def solve_line(line, method="propagate"):
+    """One output line for one input puzzle line"""
+    fields = line.replace(",", " ").split()
+    if not fields:
+        return "error: empty puzzle"
+    try:
+        cells = engine.parse(fields[0])
+        t0 = time.perf_counter()
+        solution = SOLVERS[method](cells)
+        ms = (time.perf_counter() - t0) * 1000
+    except ValueError as e:
+        return f"error: {e}"
+    if solution is None:
+        return f"unsolvable\t{ms:.3f}"
+    return f"{engine.format_cells(solution)}\t{ms:.3f}"
+
+
+def solve_chunk(lines, method):
+    return [solve_line(line, method) for line in lines]
+
+
+def read_puzzles(lines):
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def run(lines, out, method="propagate", workers=None, chunksize=256):
+    """Solve every puzzle in ``lines`` and write one line each to ``out``, in order.
+
+    Returns the number of puzzles processed, including unsolvable and error lines.
+    """
+    lines = iter(lines)
+    workers = workers or os.cpu_count()
+    count = 0
+    if workers == 1:
+        for line in lines:
+            out.write(solve_line(line, method) + "\n")
+            count += 1
+        return count
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        while True:
+            while len(pending) < workers * 4:
+                chunk = list(islice(lines, chunksize))
+                if not chunk:
+                    break
+                pending.append(pool.submit(solve_chunk, chunk, method))
+            if not pending:
+                break
+            results = pending.popleft().result()
+            out.write("\n".join(results) + "\n")
+            count += len(results)
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve puzzle files in bulk")
+    parser.add_argument("files", nargs="+", help="puzzle files, or - for stdin")
+    parser.add_argument("--method", choices=SOLVERS, default="propagate")
+    parser.add_argument("--workers", type=int, default=None, help="default: all cores")
+    parser.add_argument("--chunksize", type=int, default=256)
+    args = parser.parse_args()
+
+    def lines():
+        for name in args.files:
+            if name == "-":
+                yield from sys.stdin
+            else:
+                with open(name, encoding="utf-8") as f:
+                    yield from f
+
+    t0 = time.perf_counter()
+    count = run(read_puzzles(lines()), sys.stdout, args.method, args.workers, args.chunksize)
+    seconds = time.perf_counter() - t0
+    print(f"{count} puzzles in {seconds:.2f} s ({count / max(seconds, 1e-9):,.0f} puzzles/s)",
+          file=sys.stderr)
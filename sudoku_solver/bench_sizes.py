@@ -0,0 +1,63 @@
+"""Benchmark: solve-time distributions for 9x9, 16x16 and 25x25 boards.
+
+    python sudoku_solver/bench_sizes.py --count 20
+    python sudoku_solver/bench_sizes.py --sizes 25 --count 5 --seed 100
+
+Puzzles come from generate.py with seeds ``seed .. seed+count-1``, so
+every run times the same puzzles. Generating 25x25 puzzles takes tens of
+seconds each, and that time is reported separately from solving. Plain
+backtracking is left out because it does not finish beyond 9x9;
+bench_solvers.py compares it on hard 9x9 puzzles.
+"""
+import argparse
+import statistics
+import time
+
+import dlx
+import engine
+from generate import generate
+
+SOLVERS = {
+    "propagate": lambda cells: engine.solve(cells, "propagate"),
+    "dlx": dlx.solve,
+}
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", choices=(9, 16, 25), default=[9, 16, 25])
+    parser.add_argument("--count", type=int, default=5, help="puzzles per size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--solvers", nargs="+", choices=SOLVERS, default=list(SOLVERS))
+    args = parser.parse_args()
+
+    print(f"{'size':>5} {'solver':<10} {'clues':>6} {'min ms':>9} {'median':>9} "
+          f"{'p90':>9} {'max':>9} {'mean':>9}")
+    for size in args.sizes:
+        n = {9: 3, 16: 4, 25: 5}[size]
+        t0 = time.perf_counter()
+        puzzles = [generate(n, seed) for seed in range(args.seed, args.seed + args.count)]
+        generated = time.perf_counter() - t0
+        clues = statistics.mean(sum(1 for d in puzzle if d) for puzzle, _ in puzzles)
+
+        for name in args.solvers:
+            times = []
+            for puzzle, solution in puzzles:
+                t0 = time.perf_counter()
+                answer = SOLVERS[name](puzzle)
+                times.append((time.perf_counter() - t0) * 1000)
+                if answer != solution:
+                    raise SystemExit(f"{name} gave a wrong answer for {engine.format_cells(puzzle)}")
+            print(f"{size:>5} {name:<10} {clues:>6.0f} {min(times):>9.2f} "
+                  f"{statistics.median(times):>9.2f} {percentile(times, 0.9):>9.2f} "
+                  f"{max(times):>9.2f} {statistics.mean(times):>9.2f}")
+        print(f"{'':>5} ({args.count} puzzles generated in {generated:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Benchmark: the original list-scan solvers vs. the bitmask engine vs. DLX.
+
+    python sudoku_solver/bench_solvers.py
+    python sudoku_solver/bench_solvers.py --file top95.txt --solvers propagate dlx
+
+The built-in set is eleven well-known hard puzzles (Inkala's "hardest",
+the Norvig hard set, puzzles built against brute force), all with a
+unique solution. ``--file`` reads one 81-character puzzle per line
+instead. Plain backtracking takes minutes on some of these puzzles, so
+each run is cut off after ``--timeout`` seconds (SIGALRM, Unix only)
+and reported as a timeout.
+"""
+import argparse
+import signal
+import statistics
+import time
+
+import dlx
+import engine
+
+HARD = [
+    "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "52...6.........7.13...........4..8..6......5...........418.........3..2...87.....",
+    "6.....8.3.4.7.................5.4.7.3..2.....1.6.......2.....5.....8.6......1....",
+    "..............3.85..1.2.......5.7.....4...1...9.......5......73..2.1........4...9",
+    "85...24..72......9..4.........1.7..23.5...9...4...........8..7..17..........36.4.",
+    "..53.....8......2..7..1.5..4....53...1..7...6..32...8..6.5....9..4....3......97..",
+    "12..4......5.69.1...9...5.........7.7...52.9..3......2.9.6...5.4..9..8.1..3...9.4",
+    "...57..3.1......2.7...234......8...4..7..4...49....6.5.42...3.....7..9....18.....",
+    "7..1523........92....3.....1....47.8.......6............9...5.6.4.9.7...8....6.1.",
+    "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..",
+]
+
+
+# -------------------------------
+# The app's solvers before engine.py, minus the drawing
+# -------------------------------
+def is_valid(board, row, col, num):
+    if num in board[row]: return False
+    if num in [board[i][col] for i in range(9)]: return False
+    start_row, start_col = 3*(row//3), 3*(col//3)
+    for i in range(3):
+        for j in range(3):
+            if board[start_row+i][start_col+j] == num:
+                return False
+    return True
+
+def find_empty(board):
+    for i in range(9):
+        for j in range(9):
+            if board[i][j] == 0:
+                return i, j
+    return None
+
+def solve_backtracking(board):
+    empty = find_empty(board)
+    if not empty:
+        return True
+    row, col = empty
+    for num in range(1,10):
+        if is_valid(board,row,col,num):
+            board[row][col] = num
+            if solve_backtracking(board):
+                return True
+            board[row][col] = 0
+    return False
+
+def solve_branch_bound(board):
+    empty_cells = [(i,j) for i in range(9) for j in range(9) if board[i][j]==0]
+    if not empty_cells:
+        return True
+    min_candidates = 10
+    for i,j in empty_cells:
+        candidates = [num for num in range(1,10) if is_valid(board,i,j,num)]
+        if len(candidates) < min_candidates:
+            min_candidates = len(candidates)
+            best_cell = (i,j)
+            best_candidates = candidates
+    if min_candidates == 0:
+        return False
+    row,col = best_cell
+    for num in best_candidates:
+        board[row][col] = num
+        if solve_branch_bound(board):
+            return True
+        board[row][col] = 0
+    return False
+
+
+def _listscan(solver):
+    def solve(cells):
+        board = [cells[r * 9:r * 9 + 9] for r in range(9)]
+        return [d for row in board for d in row] if solver(board) else None
+    return solve
+
+
+SOLVERS = {
+    "original_backtracking": _listscan(solve_backtracking),
+    "original_branch_bound": _listscan(solve_branch_bound),
+    "backtracking": lambda cells: engine.solve(cells, "backtracking"),
+    "propagate": lambda cells: engine.solve(cells, "propagate"),
+    "dlx": dlx.solve,
+}
+
+
+class Timeout(Exception):
+    pass
+
+
+def _alarm(signum, frame):
+    raise Timeout
+
+
+def timed(solve, cells, timeout):
+    """Seconds taken and the solution, or (None, None) after ``timeout`` seconds"""
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        t0 = time.perf_counter()
+        solution = solve(list(cells))
+        return time.perf_counter() - t0, solution
+    except Timeout:
+        return None, None
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", help="one 81-character puzzle per line")
+    parser.add_argument("--solvers", nargs="+", choices=SOLVERS, default=list(SOLVERS))
+    parser.add_argument("--timeout", type=float, default=5.0, help="seconds per puzzle")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            puzzles = [engine.parse(line) for line in f if line.strip()]
+    else:
+        puzzles = [engine.parse(p) for p in HARD]
+    signal.signal(signal.SIGALRM, _alarm)
+
+    answers = [dlx.solve(p) for p in puzzles]
+    print(f"{len(puzzles)} puzzles, {args.timeout:g} s timeout\n")
+    print(f"{'solver':<22} {'solved':>7} {'mean ms':>10} {'median ms':>10} {'max ms':>10}")
+    for name in args.solvers:
+        times = []
+        for cells, answer in zip(puzzles, answers):
+            seconds, solution = timed(SOLVERS[name], cells, args.timeout)
+            if seconds is not None:
+                if solution != answer:
+                    raise SystemExit(f"{name} gave a wrong answer for {engine.format_cells(cells)}")
+                times.append(seconds * 1000)
+        if times:
+            print(f"{name:<22} {len(times):>7} {statistics.mean(times):>10.2f} "
+                  f"{statistics.median(times):>10.2f} {max(times):>10.2f}")
+        else:
+            print(f"{name:<22} {0:>7} {'-':>10} {'-':>10} {'-':>10}")
+    print("\n(mean/median/max over the puzzles solved within the timeout)")
+
+
+if __name__ == "__main__":
+    main()
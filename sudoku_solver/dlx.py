@@ -0,0 +1,234 @@
+"""Dancing Links (Algorithm X) exact-cover solver, and Sudoku on top of it.
+
+The links live in flat lists rather than node objects: node ``i`` has
+neighbours ``L[i]``, ``R[i]``, ``U[i]``, ``D[i]`` and column header
+``C[i]``. Node 0 is the root, nodes 1..columns are the column headers
+(``S[c]`` counts the rows left in column c), and every matrix row takes
+a consecutive run of nodes after them. The search is iterative with an
+explicit stack, so it can stop at the first solution, count up to a
+limit or yield every solution, always branching on the column with the
+fewest rows left.
+
+For Sudoku a row means "digit d in cell i" (729 rows on 9x9), and each
+row covers four columns (324 on 9x9): cell i is filled, and its row,
+column and box each hold d once. The matrix is built once per board
+size. Each puzzle copies the link lists and covers its clues before
+searching.
+
+    python sudoku_solver/dlx.py 8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.. --count
+"""
+import argparse
+import time
+from functools import lru_cache
+
+from engine import flatten, format_grid, geometry, parse
+
+
+class ExactCover:
+    def __init__(self, columns, rows):
+        """``rows`` lists the column indices (0-based) each row covers"""
+        self.columns = columns
+        n = columns + 1
+        L = [i - 1 for i in range(n)]
+        R = [i + 1 for i in range(n)]
+        L[0], R[-1] = columns, 0
+        U, D, C = list(range(n)), list(range(n)), list(range(n))
+        S = [0] * n
+        self.first = []  # first node of each row
+        self.row_of = [-1] * n  # node -> row index
+        for r, cols in enumerate(rows):
+            start = len(C)
+            self.first.append(start)
+            for k, col in enumerate(cols):
+                c, i = col + 1, start + k
+                L.append(i - 1 if k else start + len(cols) - 1)
+                R.append(i + 1 if k < len(cols) - 1 else start)
+                U.append(U[c])
+                D.append(c)
+                D[U[c]] = i
+                U[c] = i
+                C.append(c)
+                S[c] += 1
+                self.row_of.append(r)
+        self.links = (L, R, U, D, C, S)
+
+    def solutions(self, given=(), stats=None, max_guesses=None):
+        """Yield each exact cover (a sorted list of row indices) containing ``given``.
+
+        With ``max_guesses`` the search gives up after trying that many
+        rows, and sets ``stats["gave_up"]`` if a stats dict was passed.
+        """
+        L, R, U, D, C, S = (list(a) for a in self.links)
+        row_of = self.row_of
+        guesses = 0
+        budget = float("inf") if max_guesses is None else max_guesses
+        if stats is not None:
+            stats.setdefault("guesses", 0)
+
+        def cover(c):
+            L[R[c]] = L[c]
+            R[L[c]] = R[c]
+            i = D[c]
+            while i != c:
+                j = R[i]
+                while j != i:
+                    U[D[j]] = U[j]
+                    D[U[j]] = D[j]
+                    S[C[j]] -= 1
+                    j = R[j]
+                i = D[i]
+
+        def uncover(c):
+            i = U[c]
+            while i != c:
+                j = L[i]
+                while j != i:
+                    S[C[j]] += 1
+                    U[D[j]] = j
+                    D[U[j]] = j
+                    j = L[j]
+                i = U[i]
+            L[R[c]] = c
+            R[L[c]] = c
+
+        def cover_row(r):
+            j = R[r]
+            while j != r:
+                cover(C[j])
+                j = R[j]
+
+        def uncover_row(r):
+            j = L[r]
+            while j != r:
+                uncover(C[j])
+                j = L[j]
+
+        covered = set()
+        for row in given:
+            r = self.first[row]
+            j = r
+            while True:
+                if C[j] in covered:
+                    return  # two given rows overlap: no cover at all
+                covered.add(C[j])
+                j = R[j]
+                if j == r:
+                    break
+            cover(C[r])
+            cover_row(r)
+
+        stack = []
+        while True:
+            if guesses > budget:
+                if stats is not None:
+                    stats["gave_up"] = True
+                return
+            if R[0] == 0:
+                yield sorted([*given, *(row_of[r] for r in stack)])
+                descend = False
+            else:
+                c, best = R[0], S[R[0]]
+                j = R[c]
+                while j != 0 and best > 1:
+                    if S[j] < best:
+                        c, best = j, S[j]
+                    j = R[j]
+                descend = best > 0
+                if descend:
+                    cover(c)
+                    r = D[c]
+                    stack.append(r)
+                    cover_row(r)
+                    guesses += 1
+                    if stats is not None:
+                        stats["guesses"] += 1
+
+            if not descend:  # backtrack to the next untried row
+                while stack:
+                    r = stack.pop()
+                    uncover_row(r)
+                    r = D[r]
+                    if r != C[r]:
+                        stack.append(r)
+                        cover_row(r)
+                        guesses += 1
+                        if stats is not None:
+                            stats["guesses"] += 1
+                        break
+                    uncover(r)
+                else:
+                    return
+
+
+# -------------------------------
+# Sudoku
+# -------------------------------
+@lru_cache(maxsize=None)
+def sudoku_cover(n=3):
+    """The exact-cover matrix for N²×N² boards, built once per size"""
+    g = geometry(n)
+    size, cells = g.size, g.cells
+    rows = [[i, cells + g.row[i] * size + d, 2 * cells + g.col[i] * size + d,
+             3 * cells + g.box[i] * size + d]
+            for i in range(cells) for d in range(size)]
+    return ExactCover(4 * cells, rows)
+
+
+def solutions(cells, stats=None, max_guesses=None):
+    """Yield every solution of ``cells`` (flat or rows, 0 = empty)"""
+    cells, n = flatten(cells)
+    size = n * n
+    if any(not 0 < d <= size for d in cells if d):
+        return
+    given = [i * size + d - 1 for i, d in enumerate(cells) if d]
+    for rows in sudoku_cover(n).solutions(given, stats, max_guesses):
+        solved = [0] * len(cells)
+        for row in rows:
+            solved[row // size] = row % size + 1
+        yield solved
+
+
+def solve(cells, stats=None):
+    """The first solution found, or None"""
+    return next(solutions(cells, stats), None)
+
+
+def count_solutions(cells, limit=2, stats=None, max_guesses=None):
+    """Number of solutions, counting stops at ``limit`` (2 answers "is it unique?")
+
+    A search cut short by ``max_guesses`` undercounts; it is flagged in
+    ``stats["gave_up"]``.
+    """
+    count = 0
+    for _ in solutions(cells, stats, max_guesses):
+        count += 1
+        if count >= limit:
+            break
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve or count solutions with Dancing Links")
+    parser.add_argument("puzzle", help="81, 256 or 625 characters, '0' or '.' for empty cells")
+    parser.add_argument("--count", action="store_true", help="count solutions instead")
+    parser.add_argument("--limit", type=int, default=1000, help="stop counting here")
+    args = parser.parse_args()
+
+    try:
+        cells = parse(args.puzzle)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    stats = {}
+    t0 = time.perf_counter()
+    if args.count:
+        count = count_solutions(cells, args.limit, stats)
+        ms = (time.perf_counter() - t0) * 1000
+        more = "+" if count >= args.limit else ""
+        print(f"{count}{more} solutions ({stats['guesses']} guesses, {ms:.2f} ms)")
+    else:
+        solution = solve(cells, stats)
+        ms = (time.perf_counter() - t0) * 1000
+        if solution is None:
+            raise SystemExit(f"no solution ({stats['guesses']} guesses, {ms:.2f} ms)")
+        print(format_grid(solution))
+        print(f"{stats['guesses']} guesses, {ms:.2f} ms")
@@ -0,0 +1,279 @@
+"""Sudoku solver core: incremental bitmasks, singles propagation, MRV.
+
+No pygame here; app.py only draws what this module does. Boards are
+N²×N² for any box size n: 9x9 (n=3), 16x16 (n=4), 25x25 (n=5). A board
+keeps one N²-bit mask of placed digits per row, column and box (bit d-1
+for digit d), updated on every placement and undo, so the candidates of
+a cell are ``full & ~(rows[r] | cols[c] | boxes[b])``: three lookups
+instead of scanning the row, a column list and the box. Placements go
+on a trail, and backtracking pops the trail back to a mark.
+
+Methods:
+
+* ``"backtracking"``: first empty cell in reading order, digits in
+  ascending order (the app's original algorithm, now with bitmasks;
+  hopeless beyond 9x9)
+* ``"propagate"``: place naked singles (one candidate left) and hidden
+  singles (a digit with one place left in a row, column or box) until
+  none remain, then branch on the cell with the fewest candidates
+
+Puzzle text holds one character per cell: '.' or '0' for empty, 1-9,
+then A-P for 10-25. The board size follows from the cell count.
+
+    python sudoku_solver/engine.py 8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..
+"""
+import argparse
+import time
+from functools import lru_cache
+
+SYMBOLS = "123456789ABCDEFGHIJKLMNOP"  # digit d is written SYMBOLS[d - 1]
+METHODS = ("backtracking", "propagate")
+
+
+class Geometry:
+    """Index tables for a board of n x n boxes"""
+
+    def __init__(self, n):
+        self.n = n
+        self.size = size = n * n  # digits, and cells per unit
+        self.cells = size * size
+        self.full = (1 << size) - 1
+        self.row = [i // size for i in range(self.cells)]
+        self.col = [i % size for i in range(self.cells)]
+        self.box = [n * (r // n) + c // n for r, c in zip(self.row, self.col)]
+        self.place = list(zip(self.row, self.col, self.box))
+        self.units = ([[r * size + c for c in range(size)] for r in range(size)]
+                      + [[r * size + c for r in range(size)] for c in range(size)]
+                      + [[i for i in range(self.cells) if self.box[i] == b] for b in range(size)])
+
+
+@lru_cache(maxsize=None)
+def geometry(n=3):
+    return Geometry(n)
+
+
+def box_size(cell_count):
+    """n for a board of ``cell_count`` cells (81 -> 3, 256 -> 4, 625 -> 5)"""
+    n = round(cell_count ** 0.25)
+    if n < 2 or n ** 4 != cell_count or n * n > len(SYMBOLS):
+        raise ValueError(f"expected 81, 256 or 625 cells, got {cell_count}")
+    return n
+
+
+def flatten(cells):
+    """(flat cells, n) for a flat list or a list of rows"""
+    if len(cells) and isinstance(cells[0], (list, tuple)):
+        cells = [d for row in cells for d in row]
+    return list(cells), box_size(len(cells))
+
+
+def parse(text):
+    """Cells from a puzzle string; other characters (spaces, separators) are ignored"""
+    cells = []
+    for ch in text.upper():
+        if ch in ".0":
+            cells.append(0)
+        elif ch in SYMBOLS:
+            cells.append(SYMBOLS.index(ch) + 1)
+    box_size(len(cells))
+    return cells
+
+
+def format_cells(cells):
+    return "".join(SYMBOLS[d - 1] if d else "." for d in cells)
+
+
+def format_grid(cells):
+    size = geometry(box_size(len(cells))).size
+    return "\n".join(" ".join(SYMBOLS[d - 1] if d else "." for d in cells[r:r + size])
+                     for r in range(0, len(cells), size))
+
+
+class Board:
+    def __init__(self, cells, on_step=None):
+        """``cells`` is N⁴ digits (0 = empty) or N² rows of N².
+
+        ``on_step(cell, digit)`` is called on every placement, and with
+        digit 0 on every undo, so a front end can animate the search.
+        """
+        cells, n = flatten(cells)
+        self.geometry = g = geometry(n)
+        self.cells = [0] * g.cells
+        self.rows, self.cols, self.boxes = [0] * g.size, [0] * g.size, [0] * g.size
+        self.trail = []
+        self.on_step = None
+        for i, d in enumerate(cells):
+            if d:
+                if not 0 < d <= g.size or not self.candidates(i) & 1 << (d - 1):
+                    raise ValueError(f"clue {d} at row {g.row[i] + 1}, column {g.col[i] + 1} "
+                                     f"conflicts with another clue or is out of range")
+                self.place(i, d)
+        self.trail.clear()  # clues are never undone
+        self.on_step = on_step
+
+    def candidates(self, i):
+        if self.cells[i]:
+            return 0
+        r, c, b = self.geometry.place[i]
+        return self.geometry.full & ~(self.rows[r] | self.cols[c] | self.boxes[b])
+
+    def place(self, i, d):
+        bit = 1 << (d - 1)
+        r, c, b = self.geometry.place[i]
+        self.cells[i] = d
+        self.rows[r] |= bit
+        self.cols[c] |= bit
+        self.boxes[b] |= bit
+        self.trail.append(i)
+        if self.on_step is not None:
+            self.on_step(i, d)
+
+    def undo(self, mark):
+        """Clear every placement made since ``len(trail)`` was ``mark``"""
+        cells, rows, cols, boxes, trail = self.cells, self.rows, self.cols, self.boxes, self.trail
+        place = self.geometry.place
+        while len(trail) > mark:
+            i = trail.pop()
+            keep = ~(1 << (cells[i] - 1))
+            r, c, b = place[i]
+            cells[i] = 0
+            rows[r] &= keep
+            cols[c] &= keep
+            boxes[b] &= keep
+            if self.on_step is not None:
+                self.on_step(i, 0)
+
+    # -------------------------------
+    # Propagation
+    # -------------------------------
+    def propagate(self):
+        """Place naked and hidden singles until there are none left.
+
+        Returns None on a contradiction, otherwise ``(cell, candidates)``
+        for the empty cell with the fewest candidates, or ``(-1, 0)`` when
+        the board is full.
+        """
+        cells, rows, cols, boxes = self.cells, self.rows, self.cols, self.boxes
+        g = self.geometry
+        full, place = g.full, g.place
+        while True:
+            changed = False
+            best, best_mask, best_count = -1, 0, g.size + 1
+            for i in range(g.cells):
+                if cells[i]:
+                    continue
+                r, c, b = place[i]
+                mask = full & ~(rows[r] | cols[c] | boxes[b])
+                count = mask.bit_count()
+                if count == 0:
+                    return None
+                if count == 1:
+                    self.place(i, mask.bit_length())
+                    changed = True
+                elif count < best_count:
+                    best, best_mask, best_count = i, mask, count
+            if changed:
+                continue
+
+            for unit in g.units:
+                once = twice = placed = 0
+                for i in unit:
+                    if cells[i]:
+                        placed |= 1 << (cells[i] - 1)
+                    else:
+                        r, c, b = place[i]
+                        mask = full & ~(rows[r] | cols[c] | boxes[b])
+                        twice |= once & mask
+                        once |= mask
+                if once | placed != full:
+                    return None  # some digit has nowhere to go
+                hidden = once & ~twice
+                while hidden:
+                    bit = hidden & -hidden
+                    hidden ^= bit
+                    for i in unit:
+                        if not cells[i] and self.candidates(i) & bit:
+                            self.place(i, bit.bit_length())
+                            changed = True
+                            break
+                    else:
+                        return None  # its only cell was taken by another hidden single
+            if not changed:
+                return best, best_mask
+
+    # -------------------------------
+    # Search
+    # -------------------------------
+    def solve(self, method="propagate", stats=None):
+        """Fill the board in place; returns True if a solution was found"""
+        if method not in METHODS:
+            raise ValueError(f"unknown method {method!r}, expected one of {METHODS}")
+        stats = stats if stats is not None else {}
+        stats.setdefault("guesses", 0)
+        if method == "backtracking":
+            return self._backtrack(stats)
+        return self._search(stats)
+
+    def _backtrack(self, stats):
+        try:
+            i = self.cells.index(0)
+        except ValueError:
+            return True
+        mask = self.candidates(i)
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            stats["guesses"] += 1
+            mark = len(self.trail)
+            self.place(i, bit.bit_length())
+            if self._backtrack(stats):
+                return True
+            self.undo(mark)
+        return False
+
+    def _search(self, stats):
+        mark = len(self.trail)
+        choice = self.propagate()
+        if choice is None:
+            self.undo(mark)
+            return False
+        i, mask = choice
+        if i < 0:
+            return True
+        inner = len(self.trail)
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            stats["guesses"] += 1
+            self.place(i, bit.bit_length())
+            if self._search(stats):
+                return True
+            self.undo(inner)
+        self.undo(mark)
+        return False
+
+
+def solve(cells, method="propagate", on_step=None, stats=None):
+    """Solved flat cells for ``cells`` (flat or rows), or None if unsolvable"""
+    board = Board(cells, on_step)
+    return board.cells if board.solve(method, stats) else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve a puzzle from the command line")
+    parser.add_argument("puzzle", help="81, 256 or 625 characters, '0' or '.' for empty cells")
+    parser.add_argument("--method", choices=METHODS, default="propagate")
+    args = parser.parse_args()
+
+    try:
+        cells = parse(args.puzzle)
+        stats = {}
+        t0 = time.perf_counter()
+        solution = solve(cells, args.method, stats=stats)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    ms = (time.perf_counter() - t0) * 1000
+    if solution is None:
+        raise SystemExit(f"no solution ({stats['guesses']} guesses, {ms:.2f} ms)")
+    print(format_grid(solution))
+    print(f"{stats['guesses']} guesses, {ms:.2f} ms")
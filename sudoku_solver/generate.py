@@ -0,0 +1,81 @@
+"""Seeded puzzle generator for N²×N² boards with a unique solution.
+
+A solved grid comes from the standard pattern
+``(n * (r % n) + r // n + c) % N²``, shuffled with the moves that keep
+it valid: relabelling digits, swapping rows inside a band, swapping
+bands, the same for columns and stacks, and transposing. That is cheap
+for any size, where filling an empty 25x25 board by search is not.
+Clues are then removed in a random order. Each removal is kept only if
+DLX still counts exactly one solution.
+
+Once about half the clues are gone, a full uniqueness proof on 25x25
+can take minutes of DLX search per removal. So each check gets a
+budget of ``effort`` guesses per cell, and a removal whose check runs
+out is undone as if it had made the puzzle ambiguous. Puzzles stay
+unique, just with a few more clues. ``effort=None`` proves every
+removal. The same seed always produces the same puzzle.
+
+    python sudoku_solver/generate.py --size 16 --seed 7 --count 100 > puzzles16.txt
+"""
+import argparse
+import random
+import sys
+import time
+
+import dlx
+from engine import format_cells, format_grid
+
+
+def solved_grid(n, rng):
+    size = n * n
+
+    def order():
+        # a shuffled band order, then a shuffled order inside each band
+        return [band * n + k for band in rng.sample(range(n), n) for k in rng.sample(range(n), n)]
+
+    rows, cols = order(), order()
+    digits = rng.sample(range(1, size + 1), size)
+    grid = [[digits[(n * (r % n) + r // n + c) % size] for c in cols] for r in rows]
+    if rng.random() < 0.5:
+        grid = [list(col) for col in zip(*grid)]
+    return [d for row in grid for d in row]
+
+
+def generate(n=3, seed=None, effort=2, stats=None):
+    """(puzzle, solution) as flat cell lists; the puzzle has one solution"""
+    rng = random.Random(seed)
+    solution = solved_grid(n, rng)
+    puzzle = list(solution)
+    max_guesses = None if effort is None else effort * len(puzzle)
+    gave_up = 0
+    for i in rng.sample(range(len(puzzle)), len(puzzle)):
+        digit, puzzle[i] = puzzle[i], 0
+        check = {}
+        if dlx.count_solutions(puzzle, 2, check, max_guesses) != 1 or check.get("gave_up"):
+            puzzle[i] = digit
+            gave_up += check.get("gave_up", False)
+    if stats is not None:
+        stats["clues"] = sum(1 for d in puzzle if d)
+        stats["gave_up"] = gave_up
+    return puzzle, solution
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate puzzles with a unique solution")
+    parser.add_argument("--size", type=int, choices=(9, 16, 25), default=9)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--count", type=int, default=1, help="puzzles, seeds counting up")
+    parser.add_argument("--effort", type=int, default=2,
+                        help="guesses per cell for each uniqueness check, 0 for no limit")
+    parser.add_argument("--grid", action="store_true", help="print as a grid, not one line")
+    args = parser.parse_args()
+
+    n = {9: 3, 16: 4, 25: 5}[args.size]
+    for seed in range(args.seed, args.seed + args.count):
+        stats = {}
+        t0 = time.perf_counter()
+        puzzle, _ = generate(n, seed, args.effort or None, stats)
+        seconds = time.perf_counter() - t0
+        print(format_grid(puzzle) + "\n" if args.grid else format_cells(puzzle))
+        print(f"seed {seed}: {stats['clues']} clues, {stats['gave_up']} checks over budget, "
+              f"{seconds:.2f} s", file=sys.stderr)
@@ -1,16 +1,35 @@
+"""Tic-tac-toe against the AI, or any m,n,k-game (k in a row on an m x n board).
+
+    python tic_tac_toe/app.py                        # 3x3, perfect play
+    python tic_tac_toe/app.py --rows 7 --cols 7 --k 4 --budget 1
+"""
+import argparse
 import pygame
 import sys
-import math
+
+import engine
+import mnk
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--rows", type=int, default=3)
+parser.add_argument("--cols", type=int, default=3)
+parser.add_argument("--k", type=int, default=3, help="stones in a row to win")
+parser.add_argument("--budget", type=float, default=0.5, help="AI thinking time per move, seconds")
+args = parser.parse_args()
+try:
+    GAME = mnk.Game(args.rows, args.cols, args.k)
+except ValueError as e:
+    raise SystemExit(e)
 
 # Initialize pygame
 pygame.init()
 WIDTH = 600
-ROWS = 3
-CELL = WIDTH // ROWS
-LINE_WIDTH = 10
+ROWS, COLS = args.rows, args.cols
+CELL = WIDTH // max(ROWS, COLS)
+LINE_WIDTH = CELL//20
 CIRCLE_RADIUS = CELL//3
-CIRCLE_WIDTH = 10
-CROSS_WIDTH = 15
+CIRCLE_WIDTH = CELL//20
+CROSS_WIDTH = CELL*3//40
 SPACE = CELL//4
 
 # Colors
@@ -20,22 +39,23 @@ CIRCLE_COLOR = (239, 231, 200)
 CROSS_COLOR = (84, 84, 84)
 
 # Create window
-screen = pygame.display.set_mode((WIDTH, WIDTH))
+screen = pygame.display.set_mode((COLS * CELL, ROWS * CELL))
 pygame.display.set_caption("Tic-Tac-Toe with Alpha-Beta AI")
 screen.fill(BG_COLOR)
 
 # Initialize board
-board = [[" " for _ in range(ROWS)] for _ in range(ROWS)]
+board = [[" " for _ in range(COLS)] for _ in range(ROWS)]
 
 # Draw grid lines
 def draw_lines():
     for i in range(1, ROWS):
-        pygame.draw.line(screen, LINE_COLOR, (0, CELL * i), (WIDTH, CELL * i), LINE_WIDTH)
-        pygame.draw.line(screen, LINE_COLOR, (CELL * i, 0), (CELL * i, WIDTH), LINE_WIDTH)
+        pygame.draw.line(screen, LINE_COLOR, (0, CELL * i), (COLS * CELL, CELL * i), LINE_WIDTH)
+    for i in range(1, COLS):
+        pygame.draw.line(screen, LINE_COLOR, (CELL * i, 0), (CELL * i, ROWS * CELL), LINE_WIDTH)
 
 def draw_figures():
     for row in range(ROWS):
-        for col in range(ROWS):
+        for col in range(COLS):
             if board[row][col] == 'X':
                 pygame.draw.line(screen, CROSS_COLOR,
                                  (col * CELL + SPACE, row * CELL + CELL - SPACE),
@@ -49,67 +69,33 @@ def draw_figures():
                                    CIRCLE_RADIUS, CIRCLE_WIDTH)
 
 def check_winner():
-    for row in range(ROWS):
-        if board[row][0] == board[row][1] == board[row][2] != " ":
-            return board[row][0]
-    for col in range(ROWS):
-        if board[0][col] == board[1][col] == board[2][col] != " ":
-            return board[0][col]
-    if board[0][0] == board[1][1] == board[2][2] != " ":
-        return board[0][0]
-    if board[0][2] == board[1][1] == board[2][0] != " ":
-        return board[0][2]
-    return None
+    return GAME.winner(*GAME.masks(board))
 
 def is_moves_left():
     return any(" " in row for row in board)
 
-def minimax(is_maximizing, alpha, beta):
-    winner = check_winner()
-    if winner == "O": return 1
-    if winner == "X": return -1
-    if not is_moves_left(): return 0
-
-    if is_maximizing:
-        max_eval = -math.inf
-        for i in range(3):
-            for j in range(3):
-                if board[i][j] == " ":
-                    board[i][j] = "O"
-                    eval = minimax(False, alpha, beta)
-                    board[i][j] = " "
-                    max_eval = max(max_eval, eval)
-                    alpha = max(alpha, eval)
-                    if beta <= alpha:
-                        return max_eval
-        return max_eval
-    else:
-        min_eval = math.inf
-        for i in range(3):
-            for j in range(3):
-                if board[i][j] == " ":
-                    board[i][j] = "X"
-                    eval = minimax(True, alpha, beta)
-                    board[i][j] = " "
-                    min_eval = min(min_eval, eval)
-                    beta = min(beta, eval)
-                    if beta <= alpha:
-                        return min_eval
-        return min_eval
+# Classic 3x3 is solved exactly by engine.py. Larger boards use mnk.py,
+# which searches as deep as it can in --budget seconds. Either way the
+# table persists between moves.
+if (ROWS, COLS, args.k) == (3, 3, 3):
+    ENGINE = engine.Engine()
+else:
+    ENGINE = mnk.Engine(GAME)
 
 def find_best_move():
-    best_val = -math.inf
-    best_move = None
-    for i in range(3):
-        for j in range(3):
-            if board[i][j] == " ":
-                board[i][j] = "O"
-                move_val = minimax(False, -math.inf, math.inf)
-                board[i][j] = " "
-                if move_val > best_val:
-                    best_val = move_val
-                    best_move = (i, j)
-    return best_move
+    if isinstance(ENGINE, engine.Engine):
+        x, o = engine.masks(board)
+        cell, _ = ENGINE.best_move(o, x)
+        return None if cell is None else divmod(cell, 3)
+    x, o = GAME.masks(board)
+    index, _ = ENGINE.best_move(o, x, args.budget)
+    return None if index is None else GAME.position(index)
+
+def redraw():
+    screen.fill(BG_COLOR)
+    draw_lines()
+    draw_figures()
+    pygame.display.update()
 
 # Game variables
 player_turn = True
@@ -131,18 +117,15 @@ while True:
                 if board[row][col] == " ":
                     board[row][col] = "X"
                     player_turn = False
+                    redraw()  # show X while the AI thinks
 
         if not game_over and not player_turn:
-            pygame.time.delay(500)
             move = find_best_move()
             if move:
                 board[move[0]][move[1]] = "O"
             player_turn = True
 
-        screen.fill(BG_COLOR)
-        draw_lines()
-        draw_figures()
-        pygame.display.update()
+        redraw()
 
         winner = check_winner()
         if winner:
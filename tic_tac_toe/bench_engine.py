@@ -0,0 +1,148 @@
+"""Benchmark: the app's original minimax vs. the bitboard engine, per AI move.
+
+    python tic_tac_toe/bench_engine.py
+
+Times one AI move in every reachable position where O is to move, and
+separately in the 9 replies to X's opening move, which are the most
+expensive. "original" is the app's find_best_move() before engine.py,
+on a list board, without the drawing. "cold" gives every move a fresh
+engine. "warm" keeps one engine and its transposition table across all
+moves, as the app does, starting after one search from the empty
+board. Each engine move is checked against the original's game value.
+"""
+import argparse
+import math
+import time
+
+from engine import Engine, masks
+
+board = [[" "] * 3 for _ in range(3)]
+
+
+# -------------------------------
+# The app's search before engine.py
+# -------------------------------
+def check_winner():
+    for row in range(3):
+        if board[row][0] == board[row][1] == board[row][2] != " ":
+            return board[row][0]
+    for col in range(3):
+        if board[0][col] == board[1][col] == board[2][col] != " ":
+            return board[0][col]
+    if board[0][0] == board[1][1] == board[2][2] != " ":
+        return board[0][0]
+    if board[0][2] == board[1][1] == board[2][0] != " ":
+        return board[0][2]
+    return None
+
+def is_moves_left():
+    return any(" " in row for row in board)
+
+def minimax(is_maximizing, alpha, beta):
+    winner = check_winner()
+    if winner == "O": return 1
+    if winner == "X": return -1
+    if not is_moves_left(): return 0
+
+    if is_maximizing:
+        max_eval = -math.inf
+        for i in range(3):
+            for j in range(3):
+                if board[i][j] == " ":
+                    board[i][j] = "O"
+                    eval = minimax(False, alpha, beta)
+                    board[i][j] = " "
+                    max_eval = max(max_eval, eval)
+                    alpha = max(alpha, eval)
+                    if beta <= alpha:
+                        return max_eval
+        return max_eval
+    else:
+        min_eval = math.inf
+        for i in range(3):
+            for j in range(3):
+                if board[i][j] == " ":
+                    board[i][j] = "X"
+                    eval = minimax(True, alpha, beta)
+                    board[i][j] = " "
+                    min_eval = min(min_eval, eval)
+                    beta = min(beta, eval)
+                    if beta <= alpha:
+                        return min_eval
+        return min_eval
+
+def find_best_move():
+    best_val = -math.inf
+    best_move = None
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == " ":
+                board[i][j] = "O"
+                move_val = minimax(False, -math.inf, math.inf)
+                board[i][j] = " "
+                if move_val > best_val:
+                    best_val = move_val
+                    best_move = (i, j)
+    return best_move, best_val
+
+
+def positions():
+    """Every reachable, unfinished board with O to move (X moves first)"""
+    found = set()
+
+    def walk(x_turn):
+        key = tuple(map(tuple, board))
+        if key in found or check_winner() or not is_moves_left():
+            return
+        if not x_turn:
+            found.add(key)
+        for i in range(3):
+            for j in range(3):
+                if board[i][j] == " ":
+                    board[i][j] = "X" if x_turn else "O"
+                    walk(not x_turn)
+                    board[i][j] = " "
+    walk(True)
+    return sorted(found)
+
+
+def timings(found):
+    """Seconds per AI move over ``found`` for the original, a cold and a warm engine"""
+    values = []
+    t0 = time.perf_counter()
+    for key in found:
+        board[:] = [list(row) for row in key]
+        values.append(find_best_move()[1])
+    original = (time.perf_counter() - t0) / len(found)
+
+    t0 = time.perf_counter()
+    for key in found:
+        x, o = masks(key)
+        Engine().best_move(o, x)
+    cold = (time.perf_counter() - t0) / len(found)
+
+    engine = Engine()
+    engine.best_move(0, 0)  # the app's table is warm after its first game
+    t0 = time.perf_counter()
+    for key, value in zip(found, values):
+        x, o = masks(key)
+        _, score = engine.best_move(o, x)
+        if (score > 0) - (score < 0) != value:
+            raise SystemExit(f"engine scores {key} as {score}, expected the sign of {value}")
+    warm = (time.perf_counter() - t0) / len(found)
+    return original, cold, warm
+
+
+def main():
+    argparse.ArgumentParser(description=__doc__.splitlines()[0]).parse_args()
+    found = positions()
+    first = [key for key in found if sum(row.count("X") for row in key) == 1]
+
+    print(f"time per AI move, us {'original':>10} {'cold':>10} {'warm':>10}")
+    for label, group in ((f"first reply ({len(first)})", first), (f"all ({len(found)})", found)):
+        original, cold, warm = timings(group)
+        print(f"{label:<20} {original * 1e6:>10.1f} {cold * 1e6:>10.1f} {warm * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
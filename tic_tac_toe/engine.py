@@ -0,0 +1,127 @@
+"""Tic-tac-toe search on bitboards with a symmetry-folded transposition table.
+
+A position is two 9-bit masks, one per player (bit 3*row + col). A win
+is a lookup in ``WINS``, a table of all 512 masks that flags every mask
+containing one of the eight lines, so there is no board scan. The
+search is negamax with alpha-beta. Scores are from the side to move:
+``1 + empty cells`` for a win (faster wins score higher), 0 for a draw.
+
+Results go in a transposition table keyed by the canonical form of the
+position: the smallest key over the 8 rotations and reflections of the
+board. Symmetric positions share one entry. Each entry stores a score
+and whether it is exact or only a lower or upper bound, because
+alpha-beta cut the search short. The table outlives a single search, so
+once one game has been searched the AI answers from the table in
+microseconds.
+"""
+INF = 100
+EXACT, LOWER, UPPER = 0, 1, 2
+
+LINES = ([0b000000111 << 3 * r for r in range(3)]      # rows
+         + [0b001001001 << c for c in range(3)]        # columns
+         + [0b100010001, 0b001010100])                 # diagonals
+WINS = [any(mask & line == line for line in LINES) for mask in range(512)]
+FULL = 0x1FF
+ORDER = [4, 0, 2, 6, 8, 1, 3, 5, 7]  # centre, corners, edges
+
+
+def _symmetries():
+    """For each of the 8 symmetries, a table mapping every mask to its image"""
+    maps = []
+    for turns in range(4):
+        for flip in (False, True):
+            cell_map = []
+            for cell in range(9):
+                r, c = divmod(cell, 3)
+                if flip:
+                    c = 2 - c
+                for _ in range(turns):
+                    r, c = c, 2 - r
+                cell_map.append(3 * r + c)
+            maps.append(cell_map)
+    return [[sum(1 << m[cell] for cell in range(9) if mask >> cell & 1) for mask in range(512)]
+            for m in maps]
+
+
+SYMMETRIES = _symmetries()
+
+
+def canonical(me, opp):
+    return min(t[me] | t[opp] << 9 for t in SYMMETRIES)
+
+
+def winner(x, o):
+    """The winner ("X" or "O") or None, from the masks of both players"""
+    return "X" if WINS[x] else "O" if WINS[o] else None
+
+
+def masks(board):
+    """(x, o) masks for a 3x3 list-of-lists board of "X", "O" and " " """
+    x = o = 0
+    for r, row in enumerate(board):
+        for c, mark in enumerate(row):
+            if mark == "X":
+                x |= 1 << (3 * r + c)
+            elif mark == "O":
+                o |= 1 << (3 * r + c)
+    return x, o
+
+
+class Engine:
+    def __init__(self):
+        self.table = {}
+        self.nodes = 0  # positions searched (not answered from the table)
+
+    def best_move(self, me, opp):
+        """(cell, score) for the side owning ``me``; cell is None on a finished board"""
+        if WINS[me] or WINS[opp] or (me | opp) == FULL:
+            return None, 0
+        best_cell, alpha = None, -INF
+        for cell in ORDER:
+            bit = 1 << cell
+            if (me | opp) & bit:
+                continue
+            score = -self._negamax(opp, me | bit, -INF, -alpha)
+            if best_cell is None or score > alpha:
+                best_cell, alpha = cell, score
+        return best_cell, alpha
+
+    def _negamax(self, me, opp, alpha, beta):
+        occupied = me | opp
+        empty = 9 - bin(occupied).count("1")
+        if WINS[opp]:
+            return -(1 + empty)
+        if not empty:
+            return 0
+
+        key = canonical(me, opp)
+        entry = self.table.get(key)
+        if entry is not None:
+            score, flag = entry
+            if flag == EXACT:
+                return score
+            if flag == LOWER:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return score
+
+        self.nodes += 1
+        alpha0 = alpha
+        best = -INF
+        for cell in ORDER:
+            bit = 1 << cell
+            if occupied & bit:
+                continue
+            score = -self._negamax(opp, me | bit, -beta, -alpha)
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        flag = UPPER if best <= alpha0 else LOWER if best >= beta else EXACT
+        self.table[key] = (best, flag)
+        return best
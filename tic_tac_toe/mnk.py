@@ -0,0 +1,267 @@
+"""m,n,k-game engine: any board size, k in a row, searched under a time budget.
+
+A side's stones are one Python int. Cell (row, col) is bit
+``row * (cols + 1) + col``, so every row ends in an always-empty guard
+bit. Shifting by 1, cols + 1, cols + 2 or cols then moves a stone one
+step right, down or diagonally without wrapping into the next row, and
+k in a row is ``b & b >> d & b >> 2d ...`` for each direction d.
+
+Full-depth minimax is hopeless beyond 3x3, so ``Engine.best_move()``
+runs iterative deepening under a time budget:
+
+* negamax with alpha-beta and a transposition table; each entry keeps
+  depth, score, bound flag and best move, and the best move is tried
+  first on the next, deeper iteration
+* candidate moves are the empty cells within two steps of a stone; the
+  table move goes first, then two killer moves per ply, then the rest by
+  history score (cutoffs they caused, weighted by depth squared)
+* at the horizon, a heuristic scores every k-cell window that holds
+  stones of only one side, 10 ** stones each
+
+A win scores ``Game.win + empty cells`` for the winner, so faster wins
+rank higher and the score depends only on the position (safe to cache).
+``Game.win`` is larger than any heuristic score. Because far-away cells
+are never searched, a win or loss found is not a proof, so deepening
+goes on until the budget runs out or the board is searched to the end.
+When time runs out, the move from the last completed depth is played.
+
+    python tic_tac_toe/mnk.py --rows 7 --cols 7 --k 4 --budget 0.5
+"""
+import argparse
+import time
+
+INF = float("inf")
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class TimeUp(Exception):
+    pass
+
+
+class Game:
+    """Geometry of an m x n board with k in a row to win"""
+
+    def __init__(self, rows=3, cols=3, k=3):
+        if not 1 < k <= max(rows, cols):
+            raise ValueError(f"k={k} does not fit a {rows}x{cols} board")
+        self.rows, self.cols, self.k = rows, cols, k
+        self.stride = stride = cols + 1
+        self.full = sum(1 << (r * stride + c) for r in range(rows) for c in range(cols))
+        self.cells = rows * cols
+        self.directions = (1, stride, stride + 1, stride - 1)
+        self.center = (rows // 2) * stride + cols // 2
+        # every run of k cells in a line, as a mask
+        self.windows = []
+        for r in range(rows):
+            for c in range(cols):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                    if 0 <= end_r < rows and 0 <= end_c < cols:
+                        self.windows.append(sum(1 << ((r + dr * i) * stride + c + dc * i)
+                                                for i in range(k)))
+        self.weights = [0] + [10 ** i for i in range(1, k)]
+        # beats the heuristic even with every window at k - 1 stones
+        self.win = 10 ** k * len(self.windows)
+
+    def index(self, row, col):
+        return row * self.stride + col
+
+    def position(self, index):
+        return divmod(index, self.stride)
+
+    def masks(self, board):
+        """(x, o) for a list-of-lists board of "X", "O" and " " """
+        x = o = 0
+        for r, row in enumerate(board):
+            for c, mark in enumerate(row):
+                if mark == "X":
+                    x |= 1 << self.index(r, c)
+                elif mark == "O":
+                    o |= 1 << self.index(r, c)
+        return x, o
+
+    def wins(self, stones):
+        for d in self.directions:
+            run = stones
+            for i in range(1, self.k):
+                run &= stones >> (d * i)
+                if not run:
+                    break
+            else:
+                return True
+        return False
+
+    def winner(self, x, o):
+        return "X" if self.wins(x) else "O" if self.wins(o) else None
+
+    def evaluate(self, me, opp):
+        """Heuristic score for the side owning ``me``"""
+        weights = self.weights
+        score = 0
+        for window in self.windows:
+            mine = me & window
+            theirs = opp & window
+            if mine and not theirs:
+                score += weights[mine.bit_count()]
+            elif theirs and not mine:
+                score -= weights[theirs.bit_count()]
+        return score
+
+    def candidates(self, occupied):
+        """Empty cells within two steps of a stone (the centre on an empty board)"""
+        if not occupied:
+            return 1 << self.center
+        near = occupied
+        for _ in range(2):
+            grown = near
+            for d in self.directions:
+                grown |= (near << d | near >> d) & self.full
+            near = grown
+        return near & ~occupied
+
+
+class Engine:
+    def __init__(self, game):
+        self.game = game
+        self.table = {}
+        self.history = {}
+        self.killers = []
+        self.nodes = 0
+        self.depth = 0  # deepest completed iteration of the last search
+        self._deadline = None
+
+    def best_move(self, me, opp, budget=0.5, max_depth=None):
+        """(index, score) for the side owning ``me``; index is None on a finished board"""
+        game = self.game
+        occupied = me | opp
+        if game.wins(me) or game.wins(opp) or occupied == game.full:
+            return None, 0
+        self._deadline = time.perf_counter() + budget
+        self.killers = [[None, None] for _ in range(game.cells + 1)]
+        self.nodes = 0
+        self.depth = 0
+        empty = game.cells - occupied.bit_count()
+        max_depth = min(max_depth or empty, empty)
+
+        move = self._ordered(game.candidates(occupied), 0, None)[0]
+        score = 0
+        for depth in range(1, max_depth + 1):
+            try:
+                score, move = self._root(me, opp, depth)
+            except TimeUp:
+                break
+            self.depth = depth
+        return move, score
+
+    def _root(self, me, opp, depth):
+        entry = self.table.get((me, opp))
+        moves = self._ordered(self.game.candidates(me | opp), 0, entry and entry[3])
+        alpha, best_move = -INF, moves[0]
+        for index in moves:
+            score = -self._negamax(opp, me | 1 << index, depth - 1, -INF, -alpha, 1)
+            if score > alpha:
+                alpha, best_move = score, index
+        self.table[(me, opp)] = (depth, alpha, EXACT, best_move)
+        return alpha, best_move
+
+    def _negamax(self, me, opp, depth, alpha, beta, ply):
+        self.nodes += 1
+        if not self.nodes & 255 and time.perf_counter() > self._deadline:
+            raise TimeUp
+        game = self.game
+        occupied = me | opp
+        empty = game.cells - occupied.bit_count()
+        if game.wins(opp):
+            return -(game.win + empty)
+        if not empty:
+            return 0
+        if depth == 0:
+            return game.evaluate(me, opp)
+
+        key = (me, opp)
+        entry = self.table.get(key)
+        table_move = None
+        if entry is not None:
+            entry_depth, score, flag, table_move = entry
+            if entry_depth >= depth or abs(score) >= game.win:
+                if flag == EXACT:
+                    return score
+                if flag == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        alpha0 = alpha
+        best, best_move = -INF, None
+        for index in self._ordered(game.candidates(occupied), ply, table_move):
+            score = -self._negamax(opp, me | 1 << index, depth - 1, -beta, -alpha, ply + 1)
+            if score > best:
+                best, best_move = score, index
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        killers = self.killers[ply]
+                        if killers[0] != index:
+                            killers[1], killers[0] = killers[0], index
+                        self.history[index] = self.history.get(index, 0) + depth * depth
+                        break
+
+        flag = UPPER if best <= alpha0 else LOWER if best >= beta else EXACT
+        self.table[key] = (depth, best, flag, best_move)
+        return best
+
+    def _ordered(self, candidates, ply, table_move):
+        moves = []
+        while candidates:
+            low = candidates & -candidates
+            moves.append(low.bit_length() - 1)
+            candidates ^= low
+        history = self.history
+        moves.sort(key=lambda index: history.get(index, 0), reverse=True)
+        first = [table_move] if table_move in moves else []
+        for killer in self.killers[ply] if ply < len(self.killers) else ():
+            if killer in moves and killer not in first:
+                first.append(killer)
+        if first:
+            moves = first + [index for index in moves if index not in first]
+        return moves
+
+
+def render(game, x, o):
+    rows = []
+    for r in range(game.rows):
+        row = ""
+        for c in range(game.cols):
+            bit = 1 << game.index(r, c)
+            row += "X" if x & bit else "O" if o & bit else "."
+        rows.append(row)
+    return "\n".join(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Engine self-play on an m,n,k board")
+    parser.add_argument("--rows", type=int, default=7)
+    parser.add_argument("--cols", type=int, default=7)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--budget", type=float, default=0.5, help="seconds per move")
+    args = parser.parse_args()
+
+    game = Game(args.rows, args.cols, args.k)
+    engines = {"X": Engine(game), "O": Engine(game)}
+    stones = {"X": 0, "O": 0}
+    player, other = "X", "O"
+    while True:
+        engine = engines[player]
+        t0 = time.perf_counter()
+        index, score = engine.best_move(stones[player], stones[other], args.budget)
+        if index is None:
+            break
+        stones[player] |= 1 << index
+        row, col = game.position(index)
+        print(f"{player} plays {row},{col}  depth {engine.depth}, {engine.nodes} nodes, "
+              f"{(time.perf_counter() - t0) * 1000:.0f} ms, score {score}")
+        player, other = other, player
+    print(render(game, stones["X"], stones["O"]))
+    print(f"{game.winner(stones['X'], stones['O']) or 'nobody'} wins")